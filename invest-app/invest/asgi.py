@@ -8,26 +8,101 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
 
+import asyncio
 import os
+
+# Numba 캐시 디렉토리를 컨테이너 사용자가 쓸 수 있는 경로로 지정합니다.
+# 다른 모듈(예: 지표 계산 커널)이 numba를 import하기 전에 설정되어야 합니다.
+os.environ.setdefault('NUMBA_CACHE_DIR', '/tmp/numba_cache')
+os.makedirs(os.environ['NUMBA_CACHE_DIR'], exist_ok=True)
+
 import django
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 
+from invest.warmup import build_url_resolver
+
 # 올바른 환경 변수 키 사용
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'invest.settings')
 # Explicitly setup Django to avoid AppRegistryNotReady error.
 django.setup()
 
-# Import routing after django setup
-import trading.routing
+django_asgi_app = get_asgi_application()
+
+
+async def _warm_up(app):
+    """
+    워커 부팅 시점에 가짜 HTTP 요청을 한 번 처리하여 URLconf, 미들웨어 체인 등
+    Django의 지연 초기화를 미리 끝냅니다.
+    """
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/',
+        'raw_path': b'/',
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'localhost')],
+        'server': ('localhost', 80),
+        'client': ('127.0.0.1', 0),
+    }
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # 요청 처리가 끝나면 Django가 이 대기를 취소합니다.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+def _run_warm_up():
+    try:
+        asyncio.get_running_loop()
+        # 이미 실행 중인 이벤트 루프 안에서 import된 경우에는 워밍업을 건너뜁니다.
+        return
+    except RuntimeError:
+        pass
+    try:
+        asyncio.run(_warm_up(django_asgi_app))
+    except Exception:
+        pass
+
+
+build_url_resolver()
+_run_warm_up()
+
+_websocket_app = None
+
+
+async def websocket_app(scope, receive, send):
+    """
+    첫 WebSocket 연결 시점에 trading.routing을 import하여 라우터를 만듭니다.
+    HTTP만 처리하는 프로세스는 consumer/모델 import 비용을 치르지 않습니다.
+    """
+    global _websocket_app
+    if _websocket_app is None:
+        import trading.routing
+        _websocket_app = AuthMiddlewareStack(
+            URLRouter(
+                trading.routing.websocket_urlpatterns
+            )
+        )
+    return await _websocket_app(scope, receive, send)
+
 
 # HTTP와 WebSocket 프로토콜을 분기
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
-        URLRouter(
-            trading.routing.websocket_urlpatterns
-        )
-    ),
+    "http": django_asgi_app,
+    "websocket": websocket_app,
 })
\ No newline at end of file
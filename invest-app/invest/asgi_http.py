@@ -0,0 +1,10 @@
+"""
+HTTP-only ASGI entry point for the invest project.
+
+Served by the gunicorn/uvicorn workers so long-lived WebSocket connections
+never occupy the HTTP worker pool. WebSockets are served by invest.asgi_ws.
+"""
+
+from invest.asgi import django_asgi_app
+
+application = django_asgi_app
@@ -0,0 +1,30 @@
+"""
+WebSocket-only ASGI entry point for the invest project.
+
+Runs as its own protocol server so WebSocket fan-out scales independently of
+the HTTP workers. HTTP traffic is served by invest.asgi_http.
+
+Unlike invest.asgi, this module does not build the HTTP application or run its
+warm-up; the WebSocket router is built eagerly at import instead, so the first
+connection does not pay for importing the consumers.
+"""
+
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'invest.settings')
+django.setup()
+
+from channels.auth import AuthMiddlewareStack
+from channels.routing import ProtocolTypeRouter, URLRouter
+
+import trading.routing
+
+application = ProtocolTypeRouter({
+    "websocket": AuthMiddlewareStack(
+        URLRouter(
+            trading.routing.websocket_urlpatterns
+        )
+    ),
+})
@@ -7,12 +7,20 @@ source for Celery's configuration and automatically discovers task modules
 in all registered Django apps.
 """
 
-# Apply a monkey patch to fix a Numba caching bug before any other
-# library (like pandas_ta) can import numba.
-import invest.numba_patch
-
+import logging
 import os
+
+# Point Numba's on-disk cache at a directory that is always writable by the
+# container user. This must happen before any module (like the indicator kernels)
+# imports numba, otherwise caching fails with "no locator available".
+os.environ.setdefault('NUMBA_CACHE_DIR', '/tmp/numba_cache')
+os.makedirs(os.environ['NUMBA_CACHE_DIR'], exist_ok=True)
+
 from celery import Celery
+from celery.signals import worker_process_init
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'invest.settings')
@@ -29,11 +37,61 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Celery will look for a 'tasks.py' file in each app.
 app.autodiscover_tasks()
 
-@app.task(bind=True, ignore_result=True)
-def debug_task(self):
+
+@worker_process_init.connect
+def patch_numba(**kwargs):
+    """
+    Applies the numba cache workaround inside worker processes only.
+
+    Importing the patch pulls in numba (and LLVM), so it is deferred until a
+    worker process starts; beat, the Django shell and management commands
+    never load it. Connected before warm_up_jit so the patch is in place
+    before the indicators compile.
+    """
+    import invest.numba_patch  # noqa: F401
+
+
+def compile_jit_kernels():
     """
-    A sample task for debugging purposes.
+    Compiles the indicator kernel used by the AI analysis tasks, writing it
+    to the Numba cache.
 
-    Prints the request information of the task itself to the Celery worker's console.
+    Raises on failure. The Docker build calls this directly so that a broken
+    cache bake fails the build instead of being logged and ignored.
     """
-    print(f'Request: {self.request!r}')
\ No newline at end of file
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    close = rng.random(200) + 1.0
+    high = close + 0.5
+    low = close - 0.5
+
+    from trading.numba_kernels import latest_indicators
+    latest_indicators(close, high, low)
+
+
+@worker_process_init.connect
+def warm_up_jit(**kwargs):
+    """
+    Pre-compiles the JIT kernels once in every worker process.
+
+    The Numba compile (or cache load) then happens at boot instead of inside
+    the first task that needs the indicators. A failure only means the
+    kernels compile on first use, so it is logged rather than raised.
+    """
+    try:
+        compile_jit_kernels()
+    except Exception as e:
+        logger.warning(f"JIT warm-up failed, indicators will compile on first use: {e}")
+
+
+# The debug task is only registered in development.
+if settings.DEBUG:
+    @app.task(bind=True, ignore_result=True)
+    def debug_task(self):
+        """
+        A sample task for debugging purposes.
+
+        Logs the request information of the task itself to the Celery worker's log.
+        """
+        logger.debug(f'Request: {self.request!r}')
@@ -1,18 +1,27 @@
+import os
 import numba
 from functools import wraps
 
+# Numba caching is left enabled by default so that JIT-compiled functions
+# (e.g. the indicator kernels) are reused across worker restarts. Set
+# INVEST_NUMBA_DISABLE_CACHE=1 to fall back to the old behaviour of forcing
+# cache=False in environments where the cache locator cannot be used.
+DISABLE = os.environ.get('INVEST_NUMBA_DISABLE_CACHE') == '1'
+
 # Keep a reference to the original jit decorator
 original_jit = numba.jit
 
 @wraps(original_jit)
 def jit_wrapper(*args, **kwargs):
     """
-    A wrapper for numba.jit that disables caching.
+    A wrapper for numba.jit that optionally disables caching.
     This is a workaround for a bug where numba's caching mechanism fails
     in some containerized environments like Celery, raising a RuntimeError.
-    By forcing cache=False, we prevent the error.
+    When DISABLE is set, cache=False is forced to prevent the error;
+    otherwise the caller's arguments are passed through unchanged.
     """
-    kwargs['cache'] = False
+    if DISABLE:
+        kwargs['cache'] = False
     return original_jit(*args, **kwargs)
 
 # Monkey-patch numba.jit to use our wrapper
@@ -24,7 +33,8 @@ if hasattr(numba, 'njit'):
 
     @wraps(original_njit)
     def njit_wrapper(*args, **kwargs):
-        kwargs['cache'] = False
+        if DISABLE:
+            kwargs['cache'] = False
         return original_njit(*args, **kwargs)
 
     numba.njit = njit_wrapper
@@ -5,7 +5,7 @@ Django settings for the invest project.
 import os
 import sys
 from pathlib import Path
-from celery.schedules import crontab
+from zoneinfo import ZoneInfo
 
 # --- Core Paths ---
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -73,6 +73,9 @@ DATABASES = {
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD'),
         'HOST': 'invest_db',
         'PORT': 5432,
+        # Reuse connections across requests/tasks instead of reconnecting each time.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -87,6 +90,8 @@ AUTH_PASSWORD_VALIDATORS = [
 # --- Internationalization ---
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'Asia/Seoul'
+# Resolved once at import; reuse via settings.KST instead of re-parsing the zone name.
+KST = ZoneInfo(TIME_ZONE)
 USE_I18N = True
 USE_TZ = True
 
@@ -94,6 +99,21 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# --- Django REST Framework ---
+# orjson replaces the stdlib json encoder/decoder; the browsable API and form
+# parsers are kept as in DRF's defaults.
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'drf_orjson_renderer.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'drf_orjson_renderer.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
 # --- Caching (Redis) ---
 CACHES = {
     "default": {
@@ -101,6 +121,11 @@ CACHES = {
         "LOCATION": "redis://redis:6379/1",
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            # redis-py picks the hiredis parser automatically when it is installed.
+            "CONNECTION_POOL_KWARGS": {
+                "max_connections": 100,
+                "socket_keepalive": True,
+            },
         },
     }
 }
@@ -108,28 +133,57 @@ CACHES = {
 # --- Celery ---
 CELERY_BROKER_URL = 'redis://redis_invest:6379/0'
 CELERY_RESULT_BACKEND = 'redis://redis_invest:6379/0'
-CELERY_ACCEPT_CONTENT = ['application/json']
-CELERY_TASK_SERIALIZER = 'json'
-CELERY_RESULT_SERIALIZER = 'json'
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'socket_keepalive': True,
+    'health_check_interval': 30,
+}
+CELERY_BROKER_POOL_LIMIT = 50
+# msgpack keeps broker payloads compact; json stays accepted so messages
+# queued before the switch can still be consumed.
+CELERY_ACCEPT_CONTENT = ['msgpack', 'json']
+CELERY_TASK_SERIALIZER = 'msgpack'
+CELERY_RESULT_SERIALIZER = 'msgpack'
 CELERY_TIMEZONE = 'Asia/Seoul'
+# Long-running jobs hold a worker for minutes: fetch one task at a time and
+# acknowledge only after completion so a crashed worker's task is redelivered.
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+# Nothing reads task results, so skip the result-backend writes. Tasks that
+# need one can opt back in with ignore_result=False.
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ROUTES = {
+    'trading.tasks.run_daily_trader_task': {'queue': 'trading'},
+    'trading.tasks.run_stock_screening_task': {'queue': 'analysis'},
+}
 
 # --- Celery Beat (Periodic Tasks Schedule) ---
-CELERY_BEAT_SCHEDULE = {
-    # 매주 월요일 오전 8시 50분에 전체 종목 스크리닝 실행
-    'run-weekly-stock-screening': {
-        'task': 'trading.tasks.run_stock_screening_task',
-        'schedule': crontab(hour=8, minute=50, day_of_week='mon'),
-    },
-    # 매일 (월-금) 오전 9시 5분에 메인 트레이딩 로직 실행
-    'run-daily-trading': {
-        'task': 'trading.tasks.run_daily_trader_task',
-        'schedule': crontab(hour=9, minute=5, day_of_week='1-5'),
-    },
-}
+# Schedules live in the database (django_celery_beat DatabaseScheduler) and are
+# seeded by trading/migrations/0002_periodic_tasks.py. Beat wakes up at most
+# once a minute, which is enough for minute-resolution crontabs.
+CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+CELERY_BEAT_MAX_LOOP_INTERVAL = 60
 
 # --- Authentication ---
 LOGIN_URL = '/admin/login/'
 
+# --- Channels (Redis channel layer) ---
+# Two shards so group_send fan-out is spread across Redis databases and
+# WebSocket consumers can run in multiple worker processes.
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": [
+                {"address": "redis://redis_invest:6379/2"},
+                {"address": "redis://redis_invest:6379/3"},
+            ],
+            "capacity": 1500,
+            "expiry": 10,
+        },
+    }
+}
+
 # --- Testing ---
 # Use in-memory database and channel layer for tests to ensure isolation and speed.
 if 'test' in sys.argv:
@@ -148,6 +202,9 @@ if 'test' in sys.argv:
 TRADING_FEE_RATE = 0.00015  # 매매 수수료 0.015%
 TRADING_TAX_RATE = 0.0020   # 증권거래세 0.20% (매도 시 적용)
 
+# 백테스트 시세 데이터 Parquet 캐시 경로 (invalidate_historical_cache 명령으로 삭제)
+HISTORICAL_PRICE_CACHE_DIR = os.environ.get('HISTORICAL_PRICE_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'historical_prices'))
+
 # 단기 트레이딩 모드: 2단계 리스크 관리 시스템
 RISK_PER_TRADE = 0.01  # 개별 종목 최대 리스크 비율 (1%)
 MAX_TOTAL_RISK = 0.10  # 포트폴리오 최대 총 리스크 비율 (10%)
@@ -0,0 +1,14 @@
+from django.urls import get_resolver
+
+
+def build_url_resolver():
+    """
+    URL 패턴을 컴파일하고 reverse 캐시를 미리 채워 첫 요청/첫 reverse() 호출의
+    지연을 없앱니다. wsgi/asgi 진입점에서 워커 부팅 시 한 번 호출합니다.
+    """
+    try:
+        resolver = get_resolver()
+        resolver.url_patterns
+        resolver.reverse_dict
+    except Exception:
+        pass
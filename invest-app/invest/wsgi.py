@@ -1,9 +1,4 @@
 # invest-app/invest/wsgi.py
-
-# Numba Caching 버그 수정을 위한 Monkey Patch 적용
-# 이 import는 다른 라이브러리(예: pandas_ta)가 numba를 import하기 전에 실행되어야 합니다.
-import invest.numba_patch
-
 """
 WSGI config for invest project.
 
@@ -13,11 +8,53 @@ For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/wsgi/
 """
 
+import io
 import os
 
+# Numba 캐시 디렉토리를 컨테이너 사용자가 쓸 수 있는 경로로 지정합니다.
+# 다른 모듈(예: 지표 계산 커널)이 numba를 import하기 전에 설정되어야 합니다.
+os.environ.setdefault('NUMBA_CACHE_DIR', '/tmp/numba_cache')
+os.makedirs(os.environ['NUMBA_CACHE_DIR'], exist_ok=True)
+
 from django.core.wsgi import get_wsgi_application
 
-# 수정: 'autotrader.settings' -> 'invest.settings'로 변경
-os.environ.setdefault('DJANGO_SETTINGS_MODULE_I', 'invest.settings')
+from invest.warmup import build_url_resolver
 
-application = get_wsgi_application()
\ No newline at end of file
+# 수정: 'autotrader.settings' -> 'invest.settings'로 변경
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'invest.settings')
+
+application = get_wsgi_application()
+
+
+def _warm_up(app):
+    """
+    워커 부팅 시점에 가짜 요청을 한 번 처리하여 URLconf, 미들웨어 체인 등
+    Django의 지연 초기화를 미리 끝냅니다. 첫 실제 요청의 지연을 없애기 위함이며,
+    실패하더라도 워커 기동에는 영향을 주지 않습니다.
+    """
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/',
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': io.StringIO(),
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    try:
+        response = app(environ, lambda *args: None)
+        if hasattr(response, 'close'):
+            response.close()
+    except Exception:
+        pass
+
+
+build_url_resolver()
+_warm_up(application)
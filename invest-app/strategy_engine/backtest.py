@@ -1,15 +1,64 @@
 import logging
-import pandas as pd
-from datetime import timedelta
+import multiprocessing
+import os
+import tempfile
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
 from decimal import Decimal
 
+import numpy as np
+import pandas as pd
 from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connections
 from trading.kis_client import KISApiClient
-from .models import HistoricalPrice
+from .historical_cache import read_cached_history
 from trading.trading_service import DailyTrader
 
 logger = logging.getLogger(__name__)
 
+
+def load_history_data(start_date, end_date):
+    """기간 내 전체 종목의 일봉 시세를 (date, symbol) 인덱스의 DataFrame으로 로딩합니다."""
+    logger.info("백테스팅에 필요한 모든 시세 데이터를 로딩합니다...")
+    # DB 대신 Parquet 캐시에서 기간에 해당하는 부분만 컬럼 단위로 읽습니다.
+    df = read_cached_history(start_date, end_date)
+    if df.empty:
+        return df
+    # 빠른 조회를 위해 multi-index 설정
+    df.set_index(['date', 'symbol'], inplace=True)
+    return df
+
+
+@dataclass(slots=True)
+class Trade:
+    """백테스트 체결 기록 1건. 거래마다 dict를 만드는 대신 고정 필드로 저장합니다."""
+    date: date
+    type: str
+    symbol: str
+    quantity: int
+    price: float
+    profit: float = 0.0
+
+
+@dataclass(slots=True)
+class MockResponse:
+    """KISAPIResponse와 같은 인터페이스의 모의 응답. 호출마다 클래스를 새로 만들지 않도록 모듈 수준에 정의합니다."""
+    body: dict
+    ok: bool = True
+    error_message: str = ""
+
+    def is_ok(self): return self.ok
+    def get_body(self): return self.body
+    def get_error_message(self): return self.error_message
+
+
+# 모의 주문은 항상 성공하므로 응답 본문을 재사용
+ORDER_OK_BODY = {'rt_cd': '0'}
+
+
 class MockKISApiClient(KISApiClient):
     """
     백테스팅을 위한 KISApiClient의 모의(Mock) 버전.
@@ -23,142 +72,265 @@ class MockKISApiClient(KISApiClient):
 
     def get_account_balance(self):
         # 가상 계좌의 잔고를 API 응답 형식으로 반환
+        portfolio = self.backtester.portfolio
+        symbols = list(portfolio)
+        # 당일 시세 스냅샷을 한 번만 조회하여 종목별 평가금액과 총 평가금액에 함께 사용
+        prices = self.backtester.get_prices_today(symbols)
         output1 = []
-        for symbol, data in self.backtester.portfolio.items():
-            current_price = self.backtester.get_price(symbol, self.backtester.current_date)
+        stock_value = 0.0
+        for symbol, current_price in zip(symbols, prices.tolist()):
+            data = portfolio[symbol]
+            evaluation = data['quantity'] * current_price
+            stock_value += evaluation
             output1.append({
                 'pdno': symbol,
                 'hldg_qty': str(data['quantity']),
                 'pchs_amt': str(data['quantity'] * data['buy_price']),
-                'evlu_amt': str(data['quantity'] * current_price),
+                'evlu_amt': str(evaluation),
             })
 
         output2 = [{
             'dnca_tot_amt': str(self.backtester.cash),
-            'tot_evlu_amt': str(self.backtester.get_total_value()),
+            'tot_evlu_amt': str(self.backtester.cash + stock_value),
         }]
 
-        # KISAPIResponse와 유사한 객체를 반환하도록 구조화
-        class MockResponse:
-            def is_ok(self): return True
-            def get_body(self): return {'output1': output1, 'output2': output2}
-            def get_error_message(self): return ""
-        return MockResponse()
+        return MockResponse({'output1': output1, 'output2': output2})
 
     def get_current_price(self, symbol):
         price = self.backtester.get_price(symbol, self.backtester.current_date)
-        class MockResponse:
-            def is_ok(self): return price > 0
-            def get_body(self): return {'output': {'stck_prpr': str(price)}}
-            def get_error_message(self): return "Price not found" if price == 0 else ""
-        return MockResponse()
+        return MockResponse(
+            {'output': {'stck_prpr': str(price)}},
+            ok=price > 0,
+            error_message="Price not found" if price == 0 else "",
+        )
 
     def get_index_price_history(self, symbol, days):
         start = self.backtester.current_date - timedelta(days=days)
         history = self.backtester.get_history(symbol, start, self.backtester.current_date)
-        class MockResponse:
-            def is_ok(self): return bool(history)
-            def get_body(self): return {'output2': history}
-            def get_error_message(self): return ""
-        return MockResponse()
+        return MockResponse({'output2': history}, ok=bool(history))
 
     def place_order(self, account, symbol, quantity, price, order_type, fee_rate=0.0):
-        if order_type == 'BUY':
-            self.backtester._execute_buy(symbol, quantity, Decimal(price), self.backtester.current_date)
-        elif order_type == 'SELL':
-            self.backtester._execute_sell(symbol, quantity, Decimal(price), self.backtester.current_date)
+        # 매도는 즉시, 매수는 Backtester가 장 마감 시 종목별로 합산하여 체결
+        if order_type in ('BUY', 'SELL'):
+            self.backtester.queue_order(symbol, quantity, float(price), order_type)
+        return MockResponse(ORDER_OK_BODY)
 
-        class MockResponse:
-            def is_ok(self): return True
-            def get_body(self): return {'rt_cd': '0'}
-        return MockResponse()
+class BacktestDailyTrader(DailyTrader):
+    """
+    백테스트용 DailyTrader.
+    시장 모드를 매일 200일치 코스피 데이터로 다시 계산하는 대신,
+    Backtester가 미리 계산해 둔 거래일별 시장 모드를 조회합니다.
+    """
+    def __init__(self, backtester, user):
+        super().__init__(user=user)
+        self.backtester = backtester
+        self.client = MockKISApiClient(backtester)
+        self._universe_cache = {}  # {(ISO 연도, 주차): {symbol: AnalyzedStock}}
+
+    def load_analyzed_stocks(self):
+        # 유니버스는 주 1회 스크리닝으로만 갱신되므로 같은 주에는 조회 결과를 재사용
+        week_key = self.backtester.current_date.isocalendar()[:2]
+        if week_key not in self._universe_cache:
+            self._universe_cache = {week_key: super().load_analyzed_stocks()}
+        return self._universe_cache[week_key]
+
+    def get_market_mode(self):
+        market_mode = self.backtester.market_modes.get(self.backtester.current_date)
+        if market_mode is None:
+            # 해당 일자에 코스피 시세가 없으면 기존 방식으로 계산
+            return super().get_market_mode()
+
+        kospi_history = []
+        if market_mode == '우량주 분할매수 모드':
+            # 분할매수 로직의 이평선 계산에 필요한 코스피 데이터는 이 모드에서만 조회
+            kospi_history_res = self.client.get_index_price_history(symbol='0001', days=200)
+            kospi_history = kospi_history_res.get_body().get('output2', [])
+        return market_mode, kospi_history
 
 class Backtester:
-    def __init__(self, user, start_date, end_date, initial_capital=100_000_000, strategy_params=None):
+    def __init__(self, user, start_date, end_date, initial_capital=100_000_000, strategy_params=None, history_data=None):
         self.user = user
         self.start_date = start_date
         self.end_date = end_date
-        self.initial_capital = Decimal(initial_capital)
+        # 일일 루프의 금액 계산은 float로 처리하고, 리포트 출력 시에만 포맷합니다.
+        self.initial_capital = float(initial_capital)
         self.strategy_params = strategy_params if strategy_params is not None else {}
 
         self.cash = self.initial_capital
-        self.portfolio = {}  # {symbol: {'quantity': int, 'buy_price': Decimal}}
-        self.trade_log = []
+        self.portfolio = {}  # {symbol: {'quantity': int, 'buy_price': float}}
+        self.trade_log = []  # list[Trade]
+        self._pending_buys = {}  # 당일 접수된 매수 주문 {symbol: [(quantity, price)]}
         self.daily_portfolio_value = []
         self.current_date = start_date
-        self.all_history_data = self._load_all_data()
+        # 병렬 파라미터 탐색 시에는 미리 로딩된 시세 데이터를 전달받아 DB 조회를 생략
+        self.all_history_data = history_data if history_data is not None else self._load_all_data()
+        # 일자 x 종목 종가 행렬. 포트폴리오 평가를 한 번의 내적으로 처리합니다.
+        self.price_matrix = (
+            self.all_history_data['close_price'].unstack(level='symbol').sort_index()
+            if not self.all_history_data.empty else pd.DataFrame()
+        )
+        # get_price 조회용 NumPy 버퍼와 (날짜, 종목) -> (행, 열) 위치 사전
+        self._price_np = self.price_matrix.to_numpy(dtype='float64')
+        self._date_to_row = {ts.date(): i for i, ts in enumerate(self.price_matrix.index)}
+        self._sym_to_col = {s: i for i, s in enumerate(self.price_matrix.columns)}
+        self.market_modes = self._precompute_market_modes()  # {date: 시장 모드}
+        self._symbol_history_cache = {}  # {symbol: (정렬된 날짜 목록, API 형식 레코드 목록)}
 
     def _load_all_data(self):
-        logger.info("백테스팅에 필요한 모든 시세 데이터를 로딩합니다...")
-        qs = HistoricalPrice.objects.filter(date__gte=self.start_date, date__lte=self.end_date).order_by('date')
-        df = pd.DataFrame.from_records(qs.values())
-        if df.empty:
-            return df
-        df['date'] = pd.to_datetime(df['date'])
-        # 빠른 조회를 위해 multi-index 설정
-        df.set_index(['date', 'symbol'], inplace=True)
-        return df
+        return load_history_data(self.start_date, self.end_date)
+
+    def _precompute_market_modes(self):
+        """
+        코스피 60일 이동평균을 전체 기간에 대해 한 번만 계산하여
+        거래일별 시장 모드를 구합니다. (filters.determine_market_mode와 동일한 규칙)
+        """
+        if self.price_matrix.empty or '0001' not in self.price_matrix.columns:
+            return {}
+        kospi = self.price_matrix['0001'].dropna()
+        ma_60 = kospi.rolling(window=60).mean()
+        modes = np.where(kospi > ma_60, '단기 트레이딩 모드', '우량주 분할매수 모드')
+        # 60일치 데이터가 쌓이기 전에는 기본값인 단기 트레이딩 모드
+        modes[ma_60.isna().to_numpy()] = '단기 트레이딩 모드'
+        return dict(zip(kospi.index.date, modes.tolist()))
 
     def get_price(self, symbol, date):
-        try:
-            return self.all_history_data.loc[(pd.Timestamp(date), symbol), 'close_price']
-        except KeyError:
+        """지정일의 종가를 반환합니다. 시세가 없으면 0을 반환합니다."""
+        row = self._date_to_row.get(date)
+        col = self._sym_to_col.get(symbol)
+        if row is None or col is None:
             return 0
+        price = self._price_np[row, col]
+        return 0 if np.isnan(price) else price
+
+    def _get_symbol_history(self, symbol):
+        """
+        종목별 시세를 API 응답 형식의 레코드로 한 번만 변환하여 캐시합니다.
+        이후 기간 조회는 매일 DataFrame을 잘라 다시 변환하는 대신,
+        정렬된 날짜 목록에 대한 이진 탐색으로 구간 경계만 찾습니다.
+        """
+        if symbol not in self._symbol_history_cache:
+            history = None
+            if symbol in self._sym_to_col:
+                closes = self.price_matrix[symbol].dropna()
+                dates = [ts.date() for ts in closes.index]
+                # API 응답 형식과 유사하게 변환
+                records = [
+                    {'stck_bsop_date': d.strftime('%Y%m%d'), 'stck_clpr': str(p)}
+                    for d, p in zip(dates, closes.tolist())
+                ]
+                history = (dates, records)
+            self._symbol_history_cache[symbol] = history
+        return self._symbol_history_cache[symbol]
 
     def get_history(self, symbol, start, end):
-        try:
-            df_slice = self.all_history_data.loc[(pd.Timestamp(start)):(pd.Timestamp(end)), :]
-            symbol_history = df_slice[df_slice.index.get_level_values('symbol') == symbol]
-            # API 응답 형식과 유사하게 변환
-            return [{'stck_bsop_date': d.strftime('%Y%m%d'), 'stck_clpr': str(p)} for d, p in symbol_history['close_price'].items()]
-        except KeyError:
+        symbol_history = self._get_symbol_history(symbol)
+        if symbol_history is None:
             return []
+        dates, records = symbol_history
+        return records[bisect_left(dates, start):bisect_right(dates, end)]
+
+    def get_prices_today(self, symbols):
+        """
+        current_date의 종가 스냅샷에서 주어진 종목들의 가격을 배열로 반환합니다.
+        시세가 없는 종목은 0으로 평가합니다.
+        """
+        row = self._date_to_row.get(self.current_date)
+        if row is None:
+            return np.zeros(len(symbols))
+        cols = np.fromiter((self._sym_to_col.get(s, -1) for s in symbols), dtype=np.intp, count=len(symbols))
+        known = cols >= 0
+        prices = np.zeros(len(symbols))
+        prices[known] = self._price_np[row, cols[known]]
+        return np.nan_to_num(prices)
 
     def get_total_value(self):
-        holdings_value = Decimal(0)
-        for symbol, position in self.portfolio.items():
-            price = self.get_price(symbol, self.current_date)
-            if price > 0:
-                holdings_value += position['quantity'] * price
-        return self.cash + holdings_value
+        if not self.portfolio:
+            return self.cash
+        symbols = list(self.portfolio)
+        prices = self.get_prices_today(symbols)
+        quantities = np.fromiter((self.portfolio[s]['quantity'] for s in symbols), dtype='float64', count=len(symbols))
+        return self.cash + float(prices @ quantities)
 
     def run(self):
-        logger.info(f"백테스팅 시작: {self.start_date} ~ {self.end_date}")
+        logger.info("백테스팅 시작: %s ~ %s", self.start_date, self.end_date)
 
         if self.all_history_data.empty:
             logger.error("백테스팅 기간에 해당하는 데이터가 없습니다.")
             return None
 
-        # DailyTrader를 생성하고 Mock Client 주입
-        trader = DailyTrader(user=self.user)
-        trader.client = MockKISApiClient(self)
+        # Mock Client가 주입된 백테스트용 DailyTrader 생성
+        trader = BacktestDailyTrader(self, user=self.user)
 
         # 사용자 정의 파라미터가 있으면 DailyTrader의 속성을 덮어쓰기
         for param, value in self.strategy_params.items():
             if hasattr(trader, param):
-                logger.info(f"Overriding DailyTrader parameter: {param} = {value}")
+                logger.info("Overriding DailyTrader parameter: %s = %s", param, value)
                 setattr(trader, param, Decimal(value)) # 파라미터를 Decimal로 변환
 
-        while self.current_date <= self.end_date:
+        # 주말/휴장일을 건너뛰고 시세가 있는 거래일만 순회합니다.
+        trading_dates = self.all_history_data.index.get_level_values('date').unique().sort_values()
+        for trading_date in trading_dates:
+            self.current_date = trading_date.date()
+
             # DailyTrader의 로직 실행
             trader.run_daily_trading()
+            # 당일 접수된 매수 주문을 장 마감 시 일괄 체결
+            self._settle_day()
 
             # 일일 포트폴리오 가치 기록
             self.daily_portfolio_value.append({
                 'date': self.current_date,
                 'value': self.get_total_value()
             })
-            self.current_date += timedelta(days=1)
 
         return self.generate_report()
 
+    def queue_order(self, symbol, quantity, price, order_type):
+        """
+        모의 주문을 접수합니다.
+        매도는 즉시 체결하여, 같은 날 이후 조회되는 보유 종목/현금에 바로 반영합니다.
+        매수는 장 마감 시 _settle_day에서 종목별로 합산하여 체결합니다.
+        """
+        if order_type == 'SELL':
+            if symbol in self._pending_buys:
+                # 당일 매수분을 먼저 체결해야 매도할 수량이 생깁니다.
+                self._settle_buys(symbol)
+            self._execute_sell(symbol, quantity, price, self.current_date)
+        else:
+            self._pending_buys.setdefault(symbol, []).append((quantity, price))
+
+    def _settle_day(self):
+        """
+        당일 접수된 매수 주문을 종목별로 합산하여 종목당 한 번씩 체결합니다.
+
+        주문마다 즉시 체결하던 방식과의 차이:
+        - 같은 종목의 매수는 수량 가중 평균가로 거래 1건이 되며, 수수료도 합산 금액 기준으로
+          한 번만 계산됩니다. (부동소수점 반올림 수준의 차이)
+        - 미체결 매수는 당일 get_account_balance에 반영되지 않습니다.
+          DailyTrader는 매수 이후 잔고를 다시 조회하지 않으므로 매매 결정은 달라지지 않습니다.
+        - 현금 부족 시에는 합산 주문 대신 개별 주문을 접수 순서대로 체결하므로,
+          감당 가능한 주문까지만 체결됩니다. 다만 종목 간 체결 순서는 종목별 첫 접수 순서를 따릅니다.
+        """
+        for symbol in list(self._pending_buys):
+            self._settle_buys(symbol)
+
+    def _settle_buys(self, symbol):
+        orders = self._pending_buys.pop(symbol)
+        quantity = sum(q for q, _ in orders)
+        notional = sum(q * p for q, p in orders)
+        if len(orders) > 1 and self.cash < notional * (1 + settings.TRADING_FEE_RATE):
+            for order_quantity, order_price in orders:
+                self._execute_buy(symbol, order_quantity, order_price, self.current_date)
+            return
+        self._execute_buy(symbol, quantity, notional / quantity, self.current_date)
+
     def _execute_buy(self, symbol, quantity, price, date):
         cost = quantity * price
-        fee = cost * Decimal(str(settings.TRADING_FEE_RATE))
+        fee = cost * settings.TRADING_FEE_RATE
         total_cost = cost + fee
 
         if self.cash < total_cost:
-            logger.warning(f"[{date}] 현금 부족으로 {symbol} 매수 실패. 필요: {total_cost}, 보유: {self.cash}")
+            logger.warning("[%s] 현금 부족으로 %s 매수 실패. 필요: %s, 보유: %s", date, symbol, total_cost, self.cash)
             return
 
         self.cash -= total_cost
@@ -173,19 +345,16 @@ class Backtester:
         else:
             self.portfolio[symbol] = {'quantity': quantity, 'buy_price': price}
 
-        self.trade_log.append({
-            'date': date, 'type': 'BUY', 'symbol': symbol,
-            'quantity': quantity, 'price': price
-        })
+        self.trade_log.append(Trade(date, 'BUY', symbol, quantity, price))
 
     def _execute_sell(self, symbol, quantity, price, date):
         if symbol not in self.portfolio or self.portfolio[symbol]['quantity'] < quantity:
-            logger.warning(f"[{date}] 매도할 {symbol} 수량 부족.")
+            logger.warning("[%s] 매도할 %s 수량 부족.", date, symbol)
             return
 
         revenue = quantity * price
-        fee = revenue * Decimal(str(settings.TRADING_FEE_RATE))
-        tax = revenue * Decimal(str(settings.TRADING_TAX_RATE))
+        fee = revenue * settings.TRADING_FEE_RATE
+        tax = revenue * settings.TRADING_TAX_RATE
         net_revenue = revenue - fee - tax
 
         self.cash += net_revenue
@@ -197,37 +366,38 @@ class Backtester:
         if self.portfolio[symbol]['quantity'] == 0:
             del self.portfolio[symbol]
 
-        self.trade_log.append({
-            'date': date, 'type': 'SELL', 'symbol': symbol,
-            'quantity': quantity, 'price': price, 'profit': profit
-        })
+        self.trade_log.append(Trade(date, 'SELL', symbol, quantity, price, profit))
 
     def generate_report(self):
         if not self.daily_portfolio_value:
             return {"error": "No data to generate report."}
 
-        df = pd.DataFrame(self.daily_portfolio_value)
-        df['value'] = pd.to_numeric(df['value'])
-        df['date'] = pd.to_datetime(df['date'])
-        df.set_index('date', inplace=True)
+        dates = pd.to_datetime([d['date'] for d in self.daily_portfolio_value])
+        values = np.fromiter((d['value'] for d in self.daily_portfolio_value), dtype='float64', count=len(dates))
 
         # CAGR
-        final_value = df['value'].iloc[-1]
+        final_value = values[-1]
         days = (self.end_date - self.start_date).days
-        cagr = ((final_value / self.initial_capital) ** (Decimal('365.0') / days) - 1) * 100 if days > 0 else Decimal(0)
+        cagr = ((final_value / self.initial_capital) ** (365.0 / days) - 1) * 100 if days > 0 else 0.0
 
         # MDD
-        peak = df['value'].cummax()
-        drawdown = (df['value'] - peak) / peak
-        mdd = drawdown.min() * 100
-
-        # Sharpe Ratio (연율화)
-        df['daily_return'] = df['value'].pct_change()
-        sharpe_ratio = (df['daily_return'].mean() / df['daily_return'].std()) * (Decimal('252') ** Decimal('0.5')) if df['daily_return'].std() != 0 else Decimal(0)
+        peak = np.maximum.accumulate(values)
+        mdd = ((values - peak) / peak).min() * 100
+
+        # Sharpe Ratio (연율화): 일간 수익률을 float 배열로 한 번에 계산
+        daily_returns = np.diff(values) / values[:-1]
+        return_std = daily_returns.std(ddof=1) if daily_returns.size > 1 else 0.0
+        sharpe_ratio = daily_returns.mean() / return_std * np.sqrt(252) if return_std > 0 else 0.0
+
+        df = pd.DataFrame({
+            'date': dates,
+            'value': values,
+            'daily_return': np.concatenate(([np.nan], daily_returns)),
+        })
 
         # 승률
-        sell_trades = [t for t in self.trade_log if t['type'] == 'SELL']
-        wins = sum(1 for t in sell_trades if t['profit'] > 0)
+        sell_trades = [t for t in self.trade_log if t.type == 'SELL']
+        wins = sum(1 for t in sell_trades if t.profit > 0)
         total_trades = len(sell_trades)
         win_rate = (wins / total_trades) * 100 if total_trades > 0 else 0
 
@@ -241,13 +411,79 @@ class Backtester:
             "sharpe_ratio": f"{sharpe_ratio:.2f}",
             "win_rate": f"{win_rate:.2f}%",
             "total_trades": total_trades,
-            "trade_log": self.trade_log,
-            "daily_values": df.reset_index().to_dict('records')
+            "trade_log": [asdict(t) for t in self.trade_log],
+            "daily_values": df.to_dict('records')
         }
 
         logger.info("--- 백테스팅 결과 ---")
         for key, value in report.items():
             if key not in ['trade_log', 'daily_values']:
-                logger.info(f"{key.replace('_', ' ').title()}: {value}")
+                logger.info("%s: %s", key.replace('_', ' ').title(), value)
+
+        return report
+
+
+# 병렬 파라미터 탐색 워커 프로세스가 공유하는 시세 데이터 (워커마다 한 번만 로딩)
+_worker_history_data = None
 
-        return report
\ No newline at end of file
+
+def _init_sweep_worker(history_path):
+    global _worker_history_data
+    _worker_history_data = pd.read_parquet(history_path)
+
+
+def _run_single_backtest(user_id, start_date, end_date, initial_capital, strategy_params):
+    """
+    워커 프로세스에서 백테스트 1건을 실행합니다.
+    프로세스 간 전송량을 줄이기 위해 거래 내역/일별 평가금액을 제외한 요약만 반환합니다.
+    """
+    user = User.objects.get(pk=user_id)
+    backtester = Backtester(
+        user=user,
+        start_date=start_date,
+        end_date=end_date,
+        initial_capital=initial_capital,
+        strategy_params=strategy_params,
+        history_data=_worker_history_data,
+    )
+    report = backtester.run()
+    if report:
+        report = {key: value for key, value in report.items() if key not in ('trade_log', 'daily_values')}
+    return strategy_params, report
+
+
+def run_parameter_sweep(user, start_date, end_date, param_grid, initial_capital=100_000_000, max_workers=None):
+    """
+    여러 전략 파라미터 조합의 백테스트를 프로세스 풀에서 병렬로 실행합니다.
+    시세 데이터는 부모 프로세스에서 한 번만 조회하여 Parquet 파일로 저장하고,
+    각 워커는 DB 대신 이 파일을 읽어 사용합니다.
+
+    Args:
+        param_grid (list[dict]): 실행할 strategy_params 목록.
+        max_workers (int, optional): 워커 프로세스 수. 기본값은 CPU 코어 수.
+
+    Returns:
+        list[tuple[dict, dict]]: param_grid 순서대로 (strategy_params, 요약 리포트).
+    """
+    history_data = load_history_data(start_date, end_date)
+    if history_data.empty:
+        logger.error("백테스팅 기간에 해당하는 데이터가 없습니다.")
+        return [(params, None) for params in param_grid]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history_path = os.path.join(tmp_dir, 'history.parquet')
+        history_data.to_parquet(history_path)
+        # fork된 워커가 부모의 DB 소켓을 공유하지 않도록 연결을 먼저 닫습니다.
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_sweep_worker,
+            initargs=(history_path,),
+        ) as executor:
+            futures = [
+                executor.submit(_run_single_backtest, user.pk, start_date, end_date, initial_capital, params)
+                for params in param_grid
+            ]
+            return [future.result() for future in futures]
@@ -1,5 +1,6 @@
 import logging
 from decimal import Decimal
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
@@ -7,15 +8,240 @@ logger = logging.getLogger(__name__)
 # 금융업 등 특정 업종은 부채비율 기준에서 제외하기 위한 목록
 FINANCE_SECTOR_CODES = ['64', '65', '66']  # 예: 은행 및 저축기관, 보험, 증권 등 (KRX 업종 분류 기준)
 
+# 재무 데이터 항목별 기본값 (API 응답에 항목이 없을 때 사용)
+FINANCIAL_FIELD_DEFAULTS = {
+    'debt_ratio': 9999.0,
+    'interest_coverage_ratio': 0.0,
+    'roe': 0.0,
+    'operating_profit': 0.0,
+    'current_ratio': 0.0,
+    'operating_margin': 0.0,
+    'dividend_per_share': 0.0,
+    'sales': 0.0,
+    'eps': 0.0,
+}
+# 항목별 검사 상태 (순서대로 검사하다 처음 걸린 항목의 상태)
+OK, YEAR_ERROR, DATA_ERROR, NO_DIVIDEND = 0, 1, 2, 3
+
+
+def _stock_features(stock_details):
+    """종목 1개의 시장 데이터(재무 외)를 필터 입력값으로 변환합니다."""
+    return {
+        'stock_name': stock_details.get('stock_name') or '',
+        'avg_20d_turnover': float(stock_details.get('avg_20d_turnover', 0)),
+        'market_cap': float(stock_details.get('market_cap', 0)),
+        'is_excluded_issue': bool(
+            stock_details.get('is_admin_issue', False) or
+            stock_details.get('is_investment_alert', False) or
+            stock_details.get('is_capital_impaired', False)
+        ),
+        'is_finance_sector': stock_details.get('sector_code') in FINANCE_SECTOR_CODES,
+    }
+
+
+def _parse_year(record):
+    """
+    사업년도('bz_yy')를 정수로 변환합니다. 기존 int(x['bz_yy'])와 같은 규칙을 따릅니다.
+
+    Returns:
+        tuple: (연도, 오류 종류). 항목이 없거나 형식이 잘못되면 YEAR_ERROR, None 등 타입 오류는 DATA_ERROR.
+    """
+    try:
+        return int(record['bz_yy']), OK
+    except (KeyError, ValueError):
+        return np.nan, YEAR_ERROR
+    except TypeError:
+        return np.nan, DATA_ERROR
+
+
+def _build_financials_frame(financial_lists):
+    """
+    종목별 재무 데이터(list of dict)를 한 번에 float 컬럼 DataFrame으로 변환합니다.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: 항목별 float 값과, 숫자로 변환하지 못한 값의 위치(bool).
+            'stock'(종목 순번)과 'pos'(API 응답 내 순서, 0이 최신) 컬럼을 포함하며,
+            값 쪽의 'year_status'는 _parse_year의 오류 종류입니다.
+    """
+    lengths = [len(f) for f in financial_lists]
+    records = [d for financials in financial_lists for d in financials]
+    raw = pd.DataFrame.from_records(records, columns=list(FINANCIAL_FIELD_DEFAULTS))
+
+    values = pd.DataFrame(index=raw.index)
+    invalid = pd.DataFrame(index=raw.index)
+    for field, default in FINANCIAL_FIELD_DEFAULTS.items():
+        numeric = pd.to_numeric(raw[field], errors='coerce')
+        # 항목이 없으면 기본값을 쓰고, 항목이 있는데 숫자가 아니면(None 포함) 데이터 오류
+        present = np.fromiter((field in d for d in records), dtype=bool, count=len(records))
+        invalid[field] = numeric.isna().to_numpy() & present
+        values[field] = numeric.fillna(default)
+    years = [_parse_year(d) for d in records]
+    values['bz_yy'] = np.array([year for year, _ in years], dtype=np.float64)
+    values['year_status'] = np.array([status for _, status in years], dtype=int)
+
+    stock = np.repeat(np.arange(len(financial_lists)), lengths)
+    pos = np.concatenate([np.arange(n) for n in lengths]) if records else np.array([], dtype=int)
+    for frame in (values, invalid):
+        frame['stock'] = stock
+        frame['pos'] = pos
+    return values, invalid
+
+
+def _first_status(status, stock, stocks):
+    """
+    종목별로 (응답 순서상) 처음 나타난 0이 아닌 상태 값을 구합니다. 없으면 OK.
+    기존 코드가 순서대로 검사하다 처음 걸린 항목에서 멈추던 동작을 재현합니다.
+    """
+    status = pd.Series(status, index=stock)
+    return status[status != OK].groupby(level=0).first().reindex(stocks, fill_value=OK).to_numpy()
+
+
+def _financial_features(financial_lists):
+    """
+    재무 데이터로부터 '일반'/'중/장기' 조건에 사용하는 값과 데이터 오류 여부를 종목별로 집계합니다.
+    """
+    num_stocks = len(financial_lists)
+    stocks = pd.RangeIndex(num_stocks)
+    values, invalid = _build_financials_frame(financial_lists)
+
+    # 최신 재무 데이터 기준 값
+    latest = values[values['pos'] == 0].set_index('stock').reindex(stocks).fillna(FINANCIAL_FIELD_DEFAULTS)
+    latest_invalid = invalid[invalid['pos'] == 0].set_index('stock').reindex(stocks, fill_value=False)
+
+    # 최근 3개년 데이터 기준 값 (3년 평균은 항상 3으로 나눔)
+    recent_mask = values['pos'] < 3
+    recent = values[recent_mask]
+    recent_by_stock = recent.groupby('stock')
+    recent_invalid = invalid[recent_mask].groupby('stock')
+
+    def _recent(series, fill_value):
+        return series.reindex(stocks, fill_value=fill_value).to_numpy()
+
+    # 3년 연속 배당: 순서대로 검사하다 배당이 없거나 숫자가 아닌 첫 항목에서 결정
+    dividend_status = np.where(
+        invalid.loc[recent_mask, 'dividend_per_share'], DATA_ERROR,
+        np.where(recent['dividend_per_share'] > 0, OK, NO_DIVIDEND),
+    )
+
+    num_years = np.array([len(f) for f in financial_lists], dtype=int)
+    features = pd.DataFrame({
+        'num_years': num_years,
+        'debt_ratio': latest['debt_ratio'].to_numpy(),
+        'interest_coverage_ratio': latest['interest_coverage_ratio'].to_numpy(),
+        'roe': latest['roe'].to_numpy(),
+        'current_ratio': latest['current_ratio'].to_numpy(),
+        'debt_ratio_error': latest_invalid['debt_ratio'].to_numpy(),
+        'interest_coverage_ratio_error': latest_invalid['interest_coverage_ratio'].to_numpy(),
+        'roe_error': latest_invalid['roe'].to_numpy(),
+        'current_ratio_error': latest_invalid['current_ratio'].to_numpy(),
+        'op_profit_positive_years': _recent((recent['operating_profit'] > 0).groupby(recent['stock']).sum(), 0),
+        'op_profit_error': _recent(recent_invalid['operating_profit'].any(), False),
+        'avg_roe_3y': _recent(recent_by_stock['roe'].sum(), 0.0) / 3,
+        'roe_3y_error': _recent(recent_invalid['roe'].any(), False),
+        'avg_op_margin_3y': _recent(recent_by_stock['operating_margin'].sum(), 0.0) / 3,
+        'op_margin_3y_error': _recent(recent_invalid['operating_margin'].any(), False),
+        'dividend_status': _first_status(dividend_status, recent['stock'].to_numpy(), stocks),
+        'year_status': OK,
+        'growth_error': False,
+        'sales_cagr': np.nan,
+        'eps_cagr': np.nan,
+    }, index=stocks)
+
+    # 성장성 (3년 연평균): 3년 CAGR 계산을 위해 최소 4개년 데이터 필요
+    growth = values[num_years[values['stock']] >= 4]
+    if not growth.empty:
+        year_status = _first_status(growth['year_status'].to_numpy(), growth['stock'].to_numpy(), stocks)
+        features['year_status'] = year_status
+
+        # 'bz_yy' (사업년도)를 기준으로 오름차순(과거 -> 최신) 정렬 후 N-3년, N년 데이터 선택
+        valid = growth[year_status[growth['stock']] == OK]
+        ordered = valid.sort_values(['stock', 'bz_yy', 'pos'], kind='stable').groupby('stock')
+        start_data = ordered.nth(-4).set_index('stock')
+        end_data = ordered.nth(-1).set_index('stock')
+        for field in ('sales', 'eps'):
+            start = start_data[field].to_numpy()
+            end = end_data[field].to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                cagr = np.where((start > 0) & (end > 0), (end / start) ** (1 / 3) - 1, 0.0)
+            features.loc[end_data.index, f'{field}_cagr'] = cagr * 100
+
+        growth_invalid = invalid.set_index(['stock', 'pos'])
+        features.loc[end_data.index, 'growth_error'] = (
+            growth_invalid.loc[list(zip(start_data.index, start_data['pos'])), ['sales', 'eps']].any(axis=1).to_numpy() |
+            growth_invalid.loc[list(zip(end_data.index, end_data['pos'])), ['sales', 'eps']].any(axis=1).to_numpy()
+        )
+
+    return features
+
+
+def build_financial_features(stocks):
+    """
+    (stock_details, financial_data) 목록을 필터 입력용 DataFrame으로 변환합니다.
+    재무 데이터는 전체 종목분을 하나의 float DataFrame으로 한 번만 변환한 뒤 종목별로 집계합니다.
+
+    Args:
+        stocks (iterable): (stock_details, financial_data) 튜플의 목록.
+
+    Returns:
+        pd.DataFrame: 종목별 한 행으로 구성된 float/bool 컬럼 DataFrame.
+            탈락 사유 문구를 만들 때 쓰는 원본 재무 데이터('financial_data')도 함께 담습니다.
+    """
+    stocks = list(stocks)
+    market = pd.DataFrame([_stock_features(details) for details, _ in stocks])
+    if market.empty:
+        return market
+    financial_lists = [financials or [] for _, financials in stocks]
+    features = pd.concat([market, _financial_features(financial_lists)], axis=1)
+    features['financial_data'] = pd.Series(financial_lists, index=features.index, dtype=object)
+    return features
+
+
+def _select_reasons(features, rules, log_message):
+    """
+    (조건, 사유) 규칙을 순서대로 적용하여 종목별로 처음 만족한 규칙의 사유를 고릅니다.
+    사유는 문자열이거나, 원본 재무 데이터로 문구를 만드는 함수입니다. (해당 종목에만 호출)
+    """
+    conditions = [np.asarray(condition, dtype=bool) for condition, _ in rules]
+    branch = np.select(conditions, np.arange(len(rules)), default=-1)
+    reasons = np.empty(len(features), dtype=object)
+    for i, (rule, financial_data) in enumerate(zip(branch.tolist(), features['financial_data'])):
+        if rule < 0:
+            reasons[i] = "통과"
+            continue
+        reason = rules[rule][1]
+        reasons[i] = reason(financial_data) if callable(reason) else reason
+        if reasons[i] == "데이터 오류":
+            logger.warning(f"[{features['stock_name'].iat[i]}] {log_message}: 숫자로 변환할 수 없는 재무 데이터")
+    return branch < 0, reasons
+
+
+def _latest_decimal(financial_data, field, default):
+    latest_financials = financial_data[0] if financial_data else {}
+    return Decimal(latest_financials.get(field, default))
+
+
+def _recent_average(financial_data, field):
+    return sum(Decimal(d.get(field, '0')) for d in financial_data[:3]) / 3
+
+
 def _calculate_cagr(end_value, start_value, years):
     """연평균 성장률(CAGR)을 계산합니다."""
     if start_value is None or end_value is None or start_value <= 0 or end_value <= 0 or years <= 0:
         return Decimal('0')
     return (Decimal(end_value) / Decimal(start_value)) ** (Decimal('1') / Decimal(years)) - Decimal('1')
 
-def is_financially_sound(stock_details, financial_data):
+
+def _growth_cagr(financial_data, field):
+    """N-3년과 N년(사업년도 기준) 값으로 3년 CAGR(%)을 Decimal로 계산합니다. 사유 문구용."""
+    sorted_financials = sorted(financial_data, key=lambda x: int(x['bz_yy']))
+    start_value = Decimal(sorted_financials[-4].get(field, '0'))
+    end_value = Decimal(sorted_financials[-1].get(field, '0'))
+    return _calculate_cagr(end_value, start_value, 3) * 100
+
+
+def screen_financially_sound(features):
     """
-    '일반' 종목 선정을 위한 기본 재무/시장 건전성을 검사합니다.
+    '일반' 종목 선정을 위한 기본 재무/시장 건전성을 종목 전체에 대해 한 번에 검사합니다.
 
     - 거래대금 20일 평균 50억 이상
     - 시가총액 1,000억 이상
@@ -24,62 +250,42 @@ def is_financially_sound(stock_details, financial_data):
     - ROE 5% 이상
     - 최근 3년 중 2년 이상 영업이익 흑자
     - 관리종목, 투자경고/위험, 자본잠식, 스팩, 지주사 등 제외
-    """
-    try:
-        stock_name = stock_details.get('stock_name', '')
-
-        # 시장 조건
-        if stock_details.get('avg_20d_turnover', 0) < 5_000_000_000:
-            return False, "거래대금 미달"
-        if stock_details.get('market_cap', 0) < 100_000_000_000:
-            return False, "시가총액 미달"
-
-        # 제외 조건
-        if stock_details.get('is_admin_issue', False) or \
-           stock_details.get('is_investment_alert', False) or \
-           stock_details.get('is_capital_impaired', False):
-            return False, "관리/경고 종목 또는 자본잠식"
-        if '스팩' in stock_name or '지주' in stock_name:
-            return False, "스팩 또는 지주사 제외"
-
-
-        # 재무 건전성 (최신 재무 데이터 기준)
-        latest_financials = financial_data[0] if financial_data else {}
-
-        # 부채비율 (금융업 제외)
-        if stock_details.get('sector_code') not in FINANCE_SECTOR_CODES:
-            debt_ratio = Decimal(latest_financials.get('debt_ratio', '9999'))
-            if debt_ratio >= 200:
-                return False, f"부채비율 초과 ({debt_ratio}%)"
 
-        # 이자보상배율
-        interest_coverage_ratio = Decimal(latest_financials.get('interest_coverage_ratio', '0'))
-        if interest_coverage_ratio < 3:
-            return False, f"이자보상배율 미달 ({interest_coverage_ratio})"
-
-        # 수익성
-        roe = Decimal(latest_financials.get('roe', '0'))
-        if roe < 5:
-            return False, f"ROE 미달 ({roe}%)"
-
-        # 영업이익 흑자 (최근 3개년 데이터 확인)
-        op_profit_positive_years = 0
-        for data in financial_data[:3]:
-            if Decimal(data.get('operating_profit', '0')) > 0:
-                op_profit_positive_years += 1
-        if op_profit_positive_years < 2:
-            return False, "영업이익 흑자 조건 미달"
-
-        return True, "통과"
-
-    except (ValueError, TypeError, KeyError) as e:
-        logger.warning(f"재무 건전성 평가 중 오류 발생: {e}")
-        return False, "데이터 오류"
+    숫자가 아닌 재무 값은 해당 항목을 검사하는 순서에서 '데이터 오류'가 됩니다.
 
+    Args:
+        features (pd.DataFrame): build_financial_features()의 결과.
 
-def is_blue_chip(stock_details, financial_data):
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 종목별 통과 여부(bool)와 사유(str).
     """
-    '중/장기' 태그 부여를 위한 우량주 조건을 검사합니다.
+    if features.empty:
+        return np.array([], dtype=bool), np.array([], dtype=object)
+
+    is_general = ~features['is_finance_sector']
+    # 조건은 검사 순서대로 나열하며, 처음으로 만족한 조건의 사유가 선택됩니다.
+    rules = [
+        (features['avg_20d_turnover'] < 5_000_000_000, "거래대금 미달"),
+        (features['market_cap'] < 100_000_000_000, "시가총액 미달"),
+        (features['is_excluded_issue'], "관리/경고 종목 또는 자본잠식"),
+        (features['stock_name'].str.contains('스팩|지주'), "스팩 또는 지주사 제외"),
+        (is_general & features['debt_ratio_error'], "데이터 오류"),
+        (is_general & (features['debt_ratio'] >= 200),
+         lambda f: f"부채비율 초과 ({_latest_decimal(f, 'debt_ratio', '9999')}%)"),
+        (features['interest_coverage_ratio_error'], "데이터 오류"),
+        (features['interest_coverage_ratio'] < 3,
+         lambda f: f"이자보상배율 미달 ({_latest_decimal(f, 'interest_coverage_ratio', '0')})"),
+        (features['roe_error'], "데이터 오류"),
+        (features['roe'] < 5, lambda f: f"ROE 미달 ({_latest_decimal(f, 'roe', '0')}%)"),
+        (features['op_profit_error'], "데이터 오류"),
+        (features['op_profit_positive_years'] < 2, "영업이익 흑자 조건 미달"),
+    ]
+    return _select_reasons(features, rules, "재무 건전성 평가 중 오류 발생")
+
+
+def screen_blue_chip(features):
+    """
+    '중/장기' 태그 부여를 위한 우량주 조건을 종목 전체에 대해 한 번에 검사합니다.
 
     - 부채비율 100% 미만
     - 유동비율 150% 이상
@@ -88,65 +294,59 @@ def is_blue_chip(stock_details, financial_data):
     - 매출액 성장률 3년 연평균 5% 이상
     - EPS 성장률 3년 연평균 5% 이상
     - 3년 연속 배당 실시
-    """
-    try:
-        if len(financial_data) < 3:
-            return False, "3년치 재무 데이터 부족"
-
-        # 안정성
-        if Decimal(financial_data[0].get('debt_ratio', '9999')) >= 100:
-            return False, "부채비율 100% 이상"
-        if Decimal(financial_data[0].get('current_ratio', '0')) < 150:
-            return False, "유동비율 150% 미만"
-
-        # 수익성 (3년 평균)
-        avg_roe = sum(Decimal(d.get('roe', '0')) for d in financial_data[:3]) / 3
-        if avg_roe < 12:
-            return False, f"3년 평균 ROE 미달 ({avg_roe:.2f}%)"
-
-        avg_op_margin = sum(Decimal(d.get('operating_margin', '0')) for d in financial_data[:3]) / 3
-        if avg_op_margin < 10:
-            return False, f"3년 평균 영업이익률 미달 ({avg_op_margin:.2f}%)"
-
-        # 성장성 (3년 연평균)
-        if len(financial_data) < 4: # 3년 CAGR 계산을 위해 최소 4개년 데이터 필요
-            return False, "4년치 재무 데이터 부족 (CAGR 계산 불가)"
 
-        # 'bz_yy' (사업년도)를 기준으로 데이터를 오름차순(과거 -> 최신)으로 정렬
-        try:
-            sorted_financials = sorted(financial_data, key=lambda x: int(x['bz_yy']))
-        except (KeyError, ValueError):
-            return False, "재무 데이터 연도 정보 오류"
+    Args:
+        features (pd.DataFrame): build_financial_features()의 결과.
 
-        # 3년 전 데이터와 최신 데이터 추출
-        start_data = sorted_financials[-4] # 3년 전 데이터 (N-3)
-        end_data = sorted_financials[-1]   # 최신 데이터 (N)
+    Returns:
+        tuple[np.ndarray, np.ndarray]: 종목별 통과 여부(bool)와 사유(str).
+    """
+    if features.empty:
+        return np.array([], dtype=bool), np.array([], dtype=object)
+
+    rules = [
+        (features['num_years'] < 3, "3년치 재무 데이터 부족"),
+        (features['debt_ratio_error'], "데이터 오류"),
+        (features['debt_ratio'] >= 100, "부채비율 100% 이상"),
+        (features['current_ratio_error'], "데이터 오류"),
+        (features['current_ratio'] < 150, "유동비율 150% 미만"),
+        (features['roe_3y_error'], "데이터 오류"),
+        (features['avg_roe_3y'] < 12, lambda f: f"3년 평균 ROE 미달 ({_recent_average(f, 'roe'):.2f}%)"),
+        (features['op_margin_3y_error'], "데이터 오류"),
+        (features['avg_op_margin_3y'] < 10,
+         lambda f: f"3년 평균 영업이익률 미달 ({_recent_average(f, 'operating_margin'):.2f}%)"),
+        (features['num_years'] < 4, "4년치 재무 데이터 부족 (CAGR 계산 불가)"),
+        (features['year_status'] == YEAR_ERROR, "재무 데이터 연도 정보 오류"),
+        (features['year_status'] == DATA_ERROR, "데이터 오류"),
+        (features['growth_error'], "데이터 오류"),
+        (features['sales_cagr'] < 5, lambda f: f"3년 연평균 매출 성장률 미달 ({_growth_cagr(f, 'sales'):.2f}%)"),
+        (features['eps_cagr'] < 5, lambda f: f"3년 연평균 EPS 성장률 미달 ({_growth_cagr(f, 'eps'):.2f}%)"),
+        (features['dividend_status'] == DATA_ERROR, "데이터 오류"),
+        (features['dividend_status'] == NO_DIVIDEND, "3년 연속 배당 미실시"),
+    ]
+    return _select_reasons(features, rules, "우량주 평가 중 오류 발생")
 
-        start_sales = Decimal(start_data.get('sales', '0'))
-        end_sales = Decimal(end_data.get('sales', '0'))
-        start_eps = Decimal(start_data.get('eps', '0'))
-        end_eps = Decimal(end_data.get('eps', '0'))
 
-        # CAGR 계산
-        sales_cagr = _calculate_cagr(end_sales, start_sales, 3) * 100
-        eps_cagr = _calculate_cagr(end_eps, start_eps, 3) * 100
+def is_financially_sound(stock_details, financial_data):
+    """
+    단일 종목에 대한 screen_financially_sound() 래퍼.
 
-        if sales_cagr < 5:
-            return False, f"3년 연평균 매출 성장률 미달 ({sales_cagr:.2f}%)"
-        if eps_cagr < 5:
-            return False, f"3년 연평균 EPS 성장률 미달 ({eps_cagr:.2f}%)"
+    Returns:
+        tuple[bool, str]: 통과 여부와 사유.
+    """
+    passed, reasons = screen_financially_sound(build_financial_features([(stock_details, financial_data)]))
+    return bool(passed[0]), str(reasons[0])
 
-        # 주주환원
-        # 3년 연속 배당이므로 최신 3개년 데이터 확인
-        has_dividend_3yrs = all(Decimal(d.get('dividend_per_share', '0')) > 0 for d in financial_data[:3])
-        if not has_dividend_3yrs:
-            return False, "3년 연속 배당 미실시"
 
-        return True, "통과"
+def is_blue_chip(stock_details, financial_data):
+    """
+    단일 종목에 대한 screen_blue_chip() 래퍼.
 
-    except (ValueError, TypeError, KeyError) as e:
-        logger.warning(f"우량주 평가 중 오류 발생: {e}")
-        return False, "데이터 오류"
+    Returns:
+        tuple[bool, str]: 통과 여부와 사유.
+    """
+    passed, reasons = screen_blue_chip(build_financial_features([(stock_details, financial_data)]))
+    return bool(passed[0]), str(reasons[0])
 
 
 def determine_market_mode(kospi_history: list):
@@ -165,15 +365,12 @@ def determine_market_mode(kospi_history: list):
         return '단기 트레이딩 모드' # 기본값
 
     try:
-        df = pd.DataFrame(kospi_history)
+        # 최신 60일 이동평균만 필요하므로 마지막 60개 종가만 float 배열로 변환합니다.
         # KIS API에서 지수(업종) 차트의 종가는 'stck_clpr'가 아닌 'bstp_cls_prpr' 필드를 사용합니다.
-        df['close'] = pd.to_numeric(df['stck_clpr'])
-
-        # 60일 이동평균 계산
-        df['ma_60'] = df['close'].rolling(window=60).mean()
+        closes = np.fromiter((float(d['stck_clpr']) for d in kospi_history[-60:]), dtype=np.float64, count=60)
 
-        latest_close = df['close'].iloc[-1]
-        latest_ma_60 = df['ma_60'].iloc[-1]
+        latest_close = closes[-1]
+        latest_ma_60 = closes.mean()
 
         if latest_close > latest_ma_60:
             return '단기 트레이딩 모드'
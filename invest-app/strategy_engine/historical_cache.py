@@ -0,0 +1,260 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import HistoricalPrice
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['date', 'symbol', 'open_price', 'high_price', 'low_price', 'close_price', 'volume']
+# 캐시 생성 시점의 DB 상태를 기록하는 파일 (Parquet 데이터셋 디렉터리 안에 저장)
+META_FILENAME = '_cache_meta.json'
+# 캐시 디렉터리 안에서 현재 사용 중인 버전 디렉터리 이름을 가리키는 파일
+POINTER_FILENAME = 'CURRENT'
+# 재생성이 동시에 두 번 실행되지 않도록 잡는 파일 잠금
+LOCK_FILENAME = '.lock'
+VERSION_PREFIX = 'v-'
+# 종목코드 파티션('0001' 등)이 정수로 추론되지 않도록 문자열로 지정
+SYMBOL_PARTITIONING = ds.partitioning(pa.schema([('symbol', pa.string())]), flavor='hive')
+# 캐시 파일의 Arrow 스키마 (to_price_frame의 dtype과 동일)
+PRICE_SCHEMA = pa.schema([
+    ('date', pa.timestamp('ns')),
+    ('symbol', pa.string()),
+    ('open_price', pa.float64()),
+    ('high_price', pa.float64()),
+    ('low_price', pa.float64()),
+    ('close_price', pa.float64()),
+    ('volume', pa.int64()),
+])
+# 파티션 파일의 스키마 (symbol은 디렉터리 이름으로 저장)
+FILE_SCHEMA = PRICE_SCHEMA.remove(PRICE_SCHEMA.get_field_index('symbol'))
+# DB에서 한 번에 읽어 Arrow 배치로 변환하는 행 수 (파티션 파일의 최대 row group 크기이기도 합니다)
+BATCH_ROWS = 50000
+
+
+def _cache_dir():
+    return settings.HISTORICAL_PRICE_CACHE_DIR
+
+
+def _db_state():
+    """캐시 유효성 판단에 사용하는 DB 상태 (최신 일자, 전체 행 수)."""
+    state = HistoricalPrice.objects.aggregate(max_date=Max('date'), row_count=Count('id'))
+    return {
+        'max_date': state['max_date'].isoformat() if state['max_date'] else None,
+        'row_count': state['row_count'],
+    }
+
+
+def _current_dataset_dir():
+    """포인터 파일이 가리키는 현재 버전의 데이터셋 디렉터리. 캐시가 없으면 None."""
+    try:
+        with open(os.path.join(_cache_dir(), POINTER_FILENAME)) as f:
+            version = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(_cache_dir(), version) if version else None
+
+
+def _read_meta():
+    dataset_dir = _current_dataset_dir()
+    if dataset_dir is None:
+        return None
+    try:
+        with open(os.path.join(dataset_dir, META_FILENAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def _rebuild_lock():
+    """캐시 디렉터리의 잠금 파일에 배타적 잠금을 잡습니다. (프로세스 간 재생성 직렬화)"""
+    cache_dir = _cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, LOCK_FILENAME), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _switch_version(version):
+    """포인터 파일을 새 버전으로 원자적으로 교체합니다. version이 None이면 포인터를 삭제합니다."""
+    pointer_path = os.path.join(_cache_dir(), POINTER_FILENAME)
+    if version is None:
+        try:
+            os.remove(pointer_path)
+        except FileNotFoundError:
+            pass
+        return
+    tmp_path = f"{pointer_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(version)
+    os.replace(tmp_path, pointer_path)
+
+
+def _prune_versions(keep):
+    """keep에 없는 버전 디렉터리와 이전 방식(버전 없이 저장된) 캐시 파일을 삭제합니다."""
+    cache_dir = _cache_dir()
+    for name in os.listdir(cache_dir):
+        if name in keep or name in (POINTER_FILENAME, LOCK_FILENAME):
+            continue
+        path = os.path.join(cache_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def cache_version():
+    """
+    현재 Parquet 캐시가 만들어진 시점의 DB 상태를 반환합니다. 캐시가 없으면 None.
+    시세 데이터가 바뀌면 값도 바뀌므로 백테스트 결과 캐시 키에 사용합니다.
+    """
+    meta = _read_meta()
+    return f"{meta['max_date']}:{meta['row_count']}" if meta else None
+
+
+def to_price_frame(rows):
+    """
+    (date, symbol, open, high, low, close, volume) 튜플 목록을 float64/int64 컬럼의 DataFrame으로 변환합니다.
+    """
+    df = pd.DataFrame.from_records(rows, columns=PRICE_COLUMNS)
+    if df.empty:
+        return df
+    df['date'] = pd.to_datetime(df['date']).astype('datetime64[ns]')
+    # 정수로만 이루어진 가격이 int64로 추론되지 않도록 float64로 고정합니다.
+    price_columns = ['open_price', 'high_price', 'low_price', 'close_price']
+    df[price_columns] = df[price_columns].astype('float64')
+    df['volume'] = df['volume'].astype('int64')
+    return df
+
+
+def _iter_price_batches():
+    """
+    HistoricalPrice를 (종목, 일자) 순으로 BATCH_ROWS 단위씩 읽어 Arrow RecordBatch로 내보냅니다.
+    전체 테이블을 하나의 DataFrame으로 만들지 않으므로 메모리 사용량이 배치 크기로 제한됩니다.
+    """
+    rows = HistoricalPrice.objects.order_by('symbol', 'date').values_list(*PRICE_COLUMNS).iterator(chunk_size=BATCH_ROWS)
+    while batch := list(islice(rows, BATCH_ROWS)):
+        yield pa.RecordBatch.from_pandas(to_price_frame(batch), schema=PRICE_SCHEMA, preserve_index=False)
+
+
+def _write_partitions(dataset_dir):
+    """
+    종목순으로 정렬된 배치를 종목별 파티션 파일(symbol=<종목코드>/part-0.parquet)에 이어서 씁니다.
+    한 종목의 행은 연속으로 들어오므로 파일은 한 번에 하나만 열려 있고,
+    row group은 배치 경계에서만 나뉘어 종목당 대부분 1개가 됩니다.
+    DB 조회는 호출한 스레드에서만 실행됩니다. (write_dataset은 배치를 별도 스레드에서 읽습니다)
+    """
+    writer = None
+    current_symbol = None
+    try:
+        for batch in _iter_price_batches():
+            symbols = batch.column('symbol').to_numpy(zero_copy_only=False)
+            boundaries = np.flatnonzero(symbols[1:] != symbols[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(symbols)]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                if symbols[start] != current_symbol:
+                    if writer is not None:
+                        writer.close()
+                    current_symbol = symbols[start]
+                    partition_dir = os.path.join(dataset_dir, f"symbol={current_symbol}")
+                    os.makedirs(partition_dir)
+                    writer = pq.ParquetWriter(os.path.join(partition_dir, 'part-0.parquet'), FILE_SCHEMA)
+                writer.write_batch(batch.slice(start, end - start).select(FILE_SCHEMA.names), row_group_size=BATCH_ROWS)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def rebuild_cache():
+    """
+    HistoricalPrice 전체를 종목별로 파티션된 Parquet 데이터셋으로 다시 작성합니다.
+    새 버전 디렉터리에 모두 쓴 뒤 포인터 파일만 원자적으로 교체하므로, 읽는 쪽은 항상 완성된 버전을 봅니다.
+    직전 버전은 읽기 중인 프로세스를 위해 다음 재생성 때까지 남겨 둡니다.
+    """
+    with _rebuild_lock():
+        _write_new_version()
+
+
+def _write_new_version():
+    """_rebuild_lock을 잡은 상태에서 호출합니다."""
+    state = _db_state()
+
+    cache_dir = _cache_dir()
+    previous_dir = _current_dataset_dir()
+    version_dir = tempfile.mkdtemp(prefix=VERSION_PREFIX, dir=cache_dir)
+    try:
+        if state['row_count']:
+            _write_partitions(version_dir)
+        with open(os.path.join(version_dir, META_FILENAME), 'w') as f:
+            json.dump(state, f)
+        _switch_version(os.path.basename(version_dir))
+    except Exception:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    keep = {os.path.basename(version_dir)}
+    if previous_dir is not None:
+        keep.add(os.path.basename(previous_dir))
+    _prune_versions(keep)
+
+    logger.info(f"시세 데이터 Parquet 캐시를 갱신했습니다. ({state['row_count']}행, 최신 일자: {state['max_date']})")
+
+
+def invalidate_cache():
+    """
+    Parquet 캐시를 무효화합니다. 다음 백테스트에서 DB로부터 다시 생성됩니다.
+    포인터만 지우고, 읽기 중일 수 있는 마지막 버전은 다음 재생성 때 삭제됩니다.
+    """
+    with _rebuild_lock():
+        previous_dir = _current_dataset_dir()
+        _switch_version(None)
+        _prune_versions({os.path.basename(previous_dir)} if previous_dir else set())
+
+
+def ensure_cache():
+    """캐시가 없거나 DB의 최신 일자/행 수와 다르면 다시 생성합니다."""
+    if _read_meta() == _db_state():
+        return
+    with _rebuild_lock():
+        # 잠금을 기다리는 동안 다른 프로세스가 이미 재생성했을 수 있으므로 다시 확인
+        if _read_meta() != _db_state():
+            logger.info("시세 데이터 Parquet 캐시가 없거나 오래되어 다시 생성합니다...")
+            _write_new_version()
+
+
+def read_cached_history(start_date, end_date):
+    """
+    Parquet 캐시에서 기간 내 시세만 읽어 (date, symbol) 인덱스의 DataFrame으로 반환합니다.
+    """
+    ensure_cache()
+    dataset_dir = _current_dataset_dir()
+    if dataset_dir is None or not any(name.startswith('symbol=') for name in os.listdir(dataset_dir)):
+        return to_price_frame([])
+
+    df = pd.read_parquet(
+        dataset_dir,
+        partitioning=SYMBOL_PARTITIONING,
+        filters=[('date', '>=', pd.Timestamp(start_date)), ('date', '<=', pd.Timestamp(end_date))],
+    )
+    # 파티션 컬럼은 category로 읽히므로 DB 조회 결과와 같은 문자열로 되돌립니다.
+    df['symbol'] = df['symbol'].astype(str)
+    df['date'] = df['date'].astype('datetime64[ns]')
+    return df[PRICE_COLUMNS].sort_values('date', kind='stable').reset_index(drop=True)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from strategy_engine.historical_cache import invalidate_cache, rebuild_cache
+
+class Command(BaseCommand):
+    help = 'Deletes the Parquet cache of historical prices used by backtests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Rebuild the cache from the database right away.')
+
+    def handle(self, *args, **options):
+        invalidate_cache()
+        self.stdout.write(self.style.SUCCESS("Historical price cache invalidated."))
+
+        if options['rebuild']:
+            self.stdout.write("Rebuilding historical price cache...")
+            rebuild_cache()
+            self.stdout.write(self.style.SUCCESS("Historical price cache rebuilt."))
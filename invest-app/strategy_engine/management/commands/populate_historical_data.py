@@ -1,16 +1,38 @@
+import csv
+import io
 import logging
-import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Min
 from django.contrib.auth.models import User
 from trading.models import TradingAccount
-from trading.kis_client import KISApiClient
+from trading.kis_client import KISApiClient, RateLimiter
 from strategy_engine.models import HistoricalPrice
+from strategy_engine.historical_cache import invalidate_cache
 from trading.models import AnalyzedStock # To get the list of stocks
-from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
+# COPY 및 bulk_create에 사용하는 컬럼 순서
+PRICE_COLUMNS = ('symbol', 'date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
+# (symbol, date) 충돌 시 최신 값으로 갱신하는 컬럼
+UPDATE_COLUMNS = ('open_price', 'high_price', 'low_price', 'close_price', 'volume')
+# PostgreSQL 외 백엔드에서 INSERT 한 번에 담는 행 수
+BULK_BATCH_SIZE = 5000
+# 요청 기간 시작일과 가장 오래된 저장 일자의 차이가 이보다 작으면 주말/연휴로 보고 과거 구간을 다시 받지 않습니다.
+HEAD_GAP_TOLERANCE = timedelta(days=7)
+
+
+def _parse_bsop_date(value):
+    """
+    Parses a KIS 'YYYYMMDD' business date by slicing, avoiding strptime's
+    per-call format parsing on every fetched row.
+    """
+    return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+
+
 class Command(BaseCommand):
     help = 'Populates the database with historical price data for specified stocks.'
 
@@ -18,6 +40,9 @@ class Command(BaseCommand):
         parser.add_argument('username', type=str, help='The username to use for API credentials.')
         parser.add_argument('--symbols', nargs='+', type=str, help='A list of stock symbols to fetch. If not provided, it will use all symbols from AnalyzedStock.')
         parser.add_argument('--days', type=int, default=3650, help='Number of days of historical data to fetch (default: 3650, approx. 10 years).')
+        parser.add_argument('--workers', type=int, default=8, help='Number of concurrent API requests (default: 8).')
+        parser.add_argument('--rate', type=float, default=10.0, help='Maximum API calls per second across all workers (default: 10).')
+        parser.add_argument('--full', action='store_true', help='Re-fetch the whole --days window even for symbols that already have data.')
 
     def handle(self, *args, **options):
         username = options['username']
@@ -45,91 +70,208 @@ class Command(BaseCommand):
             return
 
         if not symbols:
-            symbols = list(AnalyzedStock.objects.values_list('symbol', flat=True).distinct())
+            # AnalyzedStock.symbol은 unique이므로 DISTINCT 없이 스트리밍으로 읽습니다.
+            symbols = list(AnalyzedStock.objects.values_list('symbol', flat=True).iterator(chunk_size=1000))
             self.stdout.write(self.style.SUCCESS(f"Found {len(symbols)} unique stocks in AnalyzedStock to process."))
 
-        # 백테스팅에 필수적인 코스피 지수 데이터를 항상 포함 (U.001 형태가 KIS API 업종/지수 조회 표준)
-        if '0001' not in symbols:
-            symbols.append('0001')
+        # 순서를 유지하며 중복 제거하고, 백테스팅에 필수적인 코스피 지수 데이터를 항상 포함
+        # (U.001 형태가 KIS API 업종/지수 조회 표준)
+        symbols = list(dict.fromkeys([*symbols, '0001']))
 
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_to_fetch)
 
-        for symbol in symbols:
-            self.stdout.write(f"Fetching historical data for {symbol}...")
-            try:
-                # KIS API는 한번에 100일치 데이터만 조회 가능하므로, 기간을 나누어 요청
-                # API 호출 사이에 딜레이를 주어 안정성 확보
-                is_index = symbol == '0001'
-                all_price_data = self._fetch_paginated_history(client, symbol, start_date, end_date, is_index)
-
-                if not all_price_data:
-                    self.stdout.write(self.style.WARNING(f"No data fetched for {symbol}. Skipping database population."))
-                    continue
-
-                data_to_create = []
-                for item in all_price_data:
-                    date_str = item.get('stck_bsop_date')
-                    if not date_str:
-                        logger.warning(f"Skipping item for {symbol} due to missing 'stck_bsop_date': {item}")
-                        continue
-
-                    # 지수와 일반 종목의 거래량 필드 이름이 다름
-                    volume_key = 'acml_tr_pbmn' if is_index else 'acml_vol'
-
-                    data_to_create.append(
-                        HistoricalPrice(
-                            symbol=symbol,
-                            date=datetime.strptime(date_str, '%Y%m%d').date(),
-                            open_price=Decimal(item.get('stck_oprc', '0')),
-                            high_price=Decimal(item.get('stck_hgpr', '0')),
-                            low_price=Decimal(item.get('stck_lwpr', '0')),
-                            close_price=Decimal(item.get('stck_clpr', '0')),
-                            volume=int(item.get(volume_key, '0'))
-                        )
-                    )
-
-                # 중복을 무시하고 대량 생성 (ignore_conflicts=True)
-                HistoricalPrice.objects.bulk_create(data_to_create, ignore_conflicts=True)
-                self.stdout.write(self.style.SUCCESS(f"Successfully populated {len(data_to_create)} records for {symbol}."))
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"An error occurred while processing {symbol}: {e}"))
-                logger.error(f"Error details for {symbol}:", exc_info=True)
+        # KIS API는 한번에 100일치 데이터만 조회 가능하므로, 기간을 나누어 요청합니다.
+        # (종목, 기간) 단위 요청을 스레드 풀에서 병렬로 실행하되,
+        # 공유 rate limiter로 초당 호출 수를 제한하여 API 호출 제한을 지킵니다.
+        windows_by_symbol = self._plan_windows(symbols, start_date, end_date, options['full'])
+        rate_limiter = RateLimiter(options['rate'])
+        pending = {symbol: len(windows) for symbol, windows in windows_by_symbol.items()}
+        # 종목별 {영업일자: 일봉} 사전. 수집하면서 바로 중복을 제거합니다.
+        fetched = {symbol: {} for symbol in symbols}
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {
+                executor.submit(self._fetch_window, client, symbol, window_start, window_end, rate_limiter): symbol
+                for symbol, windows in windows_by_symbol.items()
+                for window_start, window_end in windows
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    unique = fetched[symbol]
+                    for item in future.result():
+                        unique.setdefault(item['stck_bsop_date'], item)
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f"    - Could not fetch data for {symbol}: {e}"))
+                    logger.error("Fetch error details for %s:", symbol, exc_info=True)
 
+                pending[symbol] -= 1
+                if pending[symbol] == 0:
+                    # 해당 종목의 모든 기간이 수집되면 바로 적재하고 메모리를 해제합니다.
+                    self._populate_symbol(symbol, fetched.pop(symbol))
+
+        # 백테스트용 Parquet 캐시는 다음 실행 시 새 데이터로 다시 생성되도록 삭제합니다.
+        invalidate_cache()
         self.stdout.write(self.style.SUCCESS("Historical data population complete."))
 
-    def _fetch_paginated_history(self, client, symbol, start_date, end_date, is_index):
+    def _populate_symbol(self, symbol, price_data):
         """
-        Paginates through the KIS API to fetch historical data for a long period.
+        Bulk-inserts the fetched bars for one symbol, given as a dict keyed by
+        business date (already deduplicated while fetching).
         """
-        all_data = []
-        current_end = end_date
+        # 날짜순 정렬
+        all_price_data = [price_data[bsop_date] for bsop_date in sorted(price_data)]
+
+        if not all_price_data:
+            self.stdout.write(self.style.WARNING(f"No data fetched for {symbol}. Skipping database population."))
+            return
+
+        try:
+            # 지수와 일반 종목의 거래량 필드 이름이 다름
+            volume_key = 'acml_tr_pbmn' if symbol == '0001' else 'acml_vol'
+
+            rows = []
+            for item in all_price_data:
+                rows.append((
+                    symbol,
+                    _parse_bsop_date(item['stck_bsop_date']),
+                    float(item.get('stck_oprc') or 0),
+                    float(item.get('stck_hgpr') or 0),
+                    float(item.get('stck_lwpr') or 0),
+                    float(item.get('stck_clpr') or 0),
+                    int(item.get(volume_key) or 0),
+                ))
+
+            # 이미 있는 날짜는 수정된 시세로 갱신하며 대량 적재
+            self._bulk_upsert(rows)
+            self.stdout.write(self.style.SUCCESS(f"Successfully populated {len(rows)} records for {symbol}."))
+
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"An error occurred while processing {symbol}: {e}"))
+            logger.error("Error details for %s:", symbol, exc_info=True)
+
+    def _plan_windows(self, symbols, start_date, end_date, full=False):
+        """
+        Returns the request windows for each symbol.
+
+        Unless full is set, a symbol that already has data inside the requested
+        period is only fetched from its latest stored date onwards. That date is
+        included so a bar stored during the trading day gets refreshed. If its
+        earliest stored date is well after the period start (e.g. --days was
+        raised), the missing older part is fetched as well.
+        """
+        full_windows = self._build_windows(start_date, end_date)
+        if full:
+            return {symbol: full_windows for symbol in symbols}
+
+        # 종목별 최초/최신 저장 일자를 한 번의 GROUP BY 쿼리로 조회
+        stored_ranges = {
+            symbol: (earliest, latest)
+            for symbol, earliest, latest in HistoricalPrice.objects.filter(symbol__in=symbols)
+            .values('symbol').annotate(earliest=Min('date'), latest=Max('date'))
+            .values_list('symbol', 'earliest', 'latest')
+        }
+        windows_by_symbol = {}
+        backfill = 0
+        for symbol in symbols:
+            earliest, latest = stored_ranges.get(symbol, (None, None))
+            if latest is None or latest < start_date.date():
+                windows_by_symbol[symbol] = full_windows
+                continue
+            windows = self._build_windows(datetime.combine(latest, datetime.min.time()), end_date)
+            if earliest - start_date.date() > HEAD_GAP_TOLERANCE:
+                # 저장된 구간보다 오래된 시세를 추가로 수집
+                windows += self._build_windows(start_date, datetime.combine(earliest - timedelta(days=1), datetime.min.time()))
+                backfill += 1
+            windows_by_symbol[symbol] = windows
+
+        incremental = sum(1 for windows in windows_by_symbol.values() if windows is not full_windows)
+        self.stdout.write(f"{incremental} of {len(symbols)} symbols already have data and will only fetch new bars.")
+        if backfill:
+            self.stdout.write(
+                f"{backfill} of them are missing bars before their earliest stored date and will fetch that older period too "
+                "(symbols listed after the start date are re-checked on every run; use --full to re-fetch everything)."
+            )
+        return windows_by_symbol
 
+    def _build_windows(self, start_date, end_date):
+        """
+        Splits [start_date, end_date] into the <=100-day windows the KIS API accepts,
+        newest first.
+        """
+        windows = []
+        current_end = end_date
         while current_end > start_date:
             # KIS API는 한번에 100일치 데이터만 조회 가능
             current_start = max(start_date, current_end - timedelta(days=99))
-            self.stdout.write(f"  - Fetching period: {current_start.strftime('%Y-%m-%d')} to {current_end.strftime('%Y-%m-%d')}")
+            windows.append((current_start, current_end))
+            current_end = current_start - timedelta(days=1)
+        return windows
 
-            fetch_func = client.get_index_price_history if is_index else client.get_daily_price_history
+    def _fetch_window(self, client, symbol, window_start, window_end, rate_limiter):
+        """
+        Fetches one window of daily bars for a symbol. Runs on a worker thread.
+        """
+        is_index = symbol == '0001'
+        fetch_func = client.get_index_price_history if is_index else client.get_daily_price_history
 
-            # get_daily_price_history expects days, not start/end date in its current form in kis_client
-            # We will pass the symbol and days.
-            days_diff = (current_end - current_start).days + 1
-            res = fetch_func(symbol=symbol, days=days_diff) # Note: This might need adjustment if the client function changes
+        # get_daily_price_history expects days, not start/end date in its current form in kis_client
+        # We will pass the symbol and days.
+        days_diff = (window_end - window_start).days + 1
+        rate_limiter.wait()
+        res = fetch_func(symbol=symbol, days=days_diff) # Note: This might need adjustment if the client function changes
 
-            if res and res.is_ok():
-                price_list = res.get_body().get('output2', [])
-                # API가 요청 기간 내의 데이터만 반환하도록 필터링 (KIS API가 가끔 요청 기간보다 더 많이 줄 수 있음)
-                filtered_list = [p for p in price_list if current_start.strftime('%Y%m%d') <= p['stck_bsop_date'] <= current_end.strftime('%Y%m%d')]
-                all_data.extend(filtered_list)
-            else:
-                error_msg = res.text if res else 'No Response'
-                self.stdout.write(self.style.WARNING(f"    - Could not fetch data for period. Response: {error_msg}"))
+        if not (res and res.is_ok()):
+            error_msg = res.text if res else 'No Response'
+            logger.warning("Could not fetch data for %s (%s ~ %s). Response: %s",
+                           symbol, window_start.date(), window_end.date(), error_msg)
+            return []
 
-            current_end = current_start - timedelta(days=1)
-            time.sleep(0.2) # API 호출 제한을 피하기 위한 딜레이
+        price_list = res.get_body().get('output2', [])
+        # API가 요청 기간 내의 데이터만 반환하도록 필터링 (KIS API가 가끔 요청 기간보다 더 많이 줄 수 있음)
+        start_str = window_start.strftime('%Y%m%d')
+        end_str = window_end.strftime('%Y%m%d')
+        return [p for p in price_list if start_str <= p.get('stck_bsop_date', '') <= end_str]
 
-        # 중복 제거 및 날짜순 정렬
-        unique_data = {item['stck_bsop_date']: item for item in all_data}
-        return sorted(unique_data.values(), key=lambda x: x['stck_bsop_date'])
\ No newline at end of file
+    def _bulk_upsert(self, rows):
+        """
+        Upserts price rows, overwriting the OHLCV values of any (symbol, date)
+        that already exists so that corrected prices from the API are kept.
+
+        On PostgreSQL the rows are streamed with COPY into a temporary staging
+        table and moved over with INSERT ... ON CONFLICT DO UPDATE, avoiding
+        per-row ORM object construction. Other backends fall back to a batched
+        bulk_create(update_conflicts=True).
+        """
+        if not rows:
+            return
+
+        if connection.vendor != 'postgresql':
+            HistoricalPrice.objects.bulk_create(
+                [HistoricalPrice(**dict(zip(PRICE_COLUMNS, row))) for row in rows],
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['symbol', 'date'],
+                update_fields=list(UPDATE_COLUMNS),
+            )
+            return
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        table = HistoricalPrice._meta.db_table
+        columns = ', '.join(PRICE_COLUMNS)
+        updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in UPDATE_COLUMNS)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE historicalprice_staging ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            cursor.copy_expert(f"COPY historicalprice_staging ({columns}) FROM STDIN WITH CSV", buffer)
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM historicalprice_staging "
+                f"ON CONFLICT (symbol, date) DO UPDATE SET {updates}"
+            )
@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from datetime import datetime
-from strategy_engine.backtest import Backtester
+from itertools import product
+from strategy_engine.backtest import Backtester, run_parameter_sweep
 
 class Command(BaseCommand):
     help = 'Runs a backtest of the trading strategy for a given period with adjustable parameters.'
@@ -11,9 +12,10 @@ class Command(BaseCommand):
         parser.add_argument('start_date', type=str, help='Start date (YYYY-MM-DD).')
         parser.add_argument('end_date', type=str, help='End date (YYYY-MM-DD).')
         parser.add_argument('--capital', type=int, default=100_000_000, help='Initial capital.')
-        # 전략 파라미터 추가
-        parser.add_argument('--risk-per-trade', type=float, help='Max risk per trade (e.g., 0.01 for 1%).')
-        parser.add_argument('--max-total-risk', type=float, help='Max total portfolio risk (e.g., 0.1 for 10%).')
+        # 전략 파라미터 추가 (여러 값을 주면 모든 조합을 병렬로 백테스트)
+        parser.add_argument('--risk-per-trade', type=float, nargs='+', help='Max risk per trade (e.g., 0.01 for 1%). Pass several values to sweep.')
+        parser.add_argument('--max-total-risk', type=float, nargs='+', help='Max total portfolio risk (e.g., 0.1 for 10%). Pass several values to sweep.')
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes for a parameter sweep (default: CPU count).')
 
     def handle(self, *args, **options):
         try:
@@ -35,10 +37,15 @@ class Command(BaseCommand):
             }
 
             # 커맨드 라인 인자로 받은 파라미터가 있으면 strategy_params에 추가
-            if options['risk_per_trade'] is not None:
-                backtest_params['strategy_params']['risk_per_trade'] = options['risk_per_trade']
-            if options['max_total_risk'] is not None:
-                backtest_params['strategy_params']['max_total_risk'] = options['max_total_risk']
+            param_values = {
+                name: options[name] for name in ('risk_per_trade', 'max_total_risk')
+                if options[name] is not None
+            }
+            param_grid = [dict(zip(param_values, combo)) for combo in product(*param_values.values())]
+            if len(param_grid) > 1:
+                self._run_sweep(user, start_date, end_date, options['capital'], param_grid, options['workers'])
+                return
+            backtest_params['strategy_params'] = param_grid[0]
 
             self.stdout.write(self.style.SUCCESS(f"Starting backtest for user '{user.username}'..."))
             self.stdout.write(f"Period: {start_date} to {end_date}")
@@ -65,4 +72,18 @@ class Command(BaseCommand):
         except ValueError as e:
             self.stdout.write(self.style.ERROR(f"Invalid date format or argument. Please use YYYY-MM-DD. Error: {e}"))
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f"An unexpected error occurred: {e}"))
+
+    def _run_sweep(self, user, start_date, end_date, capital, param_grid, workers):
+        self.stdout.write(self.style.SUCCESS(f"Starting parameter sweep of {len(param_grid)} backtests for user '{user.username}'..."))
+        self.stdout.write(f"Period: {start_date} to {end_date}")
+
+        results = run_parameter_sweep(user, start_date, end_date, param_grid, initial_capital=capital, max_workers=workers)
+
+        self.stdout.write(self.style.SUCCESS("\n--- Parameter Sweep Finished ---"))
+        for params, report in results:
+            label = ", ".join(f"{key}={value}" for key, value in params.items())
+            if report and "error" not in report:
+                self.stdout.write(f"{label}: Final {report['final_value']}, CAGR {report['cagr']}, MDD {report['mdd']}, Sharpe {report['sharpe_ratio']}")
+            else:
+                self.stdout.write(self.style.ERROR(f"{label}: Backtest failed or produced no results."))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:26
+
+from django.db import migrations, models
+
+
+# 날짜순으로만 추가되는 시계열 테이블이므로, 기간 조회에는 작은 BRIN 인덱스로 충분합니다.
+# BRIN은 PostgreSQL 전용이라 테스트용 SQLite에서는 건너뜁니다.
+def create_date_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX hp_date_brin ON strategy_engine_historicalprice "
+            "USING BRIN (date) WITH (pages_per_range = 32)"
+        )
+
+
+def drop_date_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS hp_date_brin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('strategy_engine', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historicalprice',
+            name='date',
+            field=models.DateField(help_text='날짜'),
+        ),
+        migrations.AlterField(
+            model_name='historicalprice',
+            name='symbol',
+            field=models.CharField(help_text='종목 코드', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='historicalprice',
+            index=models.Index(fields=['symbol', 'date'], include=('open_price', 'high_price', 'low_price', 'close_price', 'volume'), name='hp_sym_date_cov'),
+        ),
+        migrations.RunPython(create_date_brin_index, drop_date_brin_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('strategy_engine', '0002_historicalprice_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historicalprice',
+            name='close_price',
+            field=models.FloatField(help_text='종가'),
+        ),
+        migrations.AlterField(
+            model_name='historicalprice',
+            name='high_price',
+            field=models.FloatField(help_text='고가'),
+        ),
+        migrations.AlterField(
+            model_name='historicalprice',
+            name='low_price',
+            field=models.FloatField(help_text='저가'),
+        ),
+        migrations.AlterField(
+            model_name='historicalprice',
+            name='open_price',
+            field=models.FloatField(help_text='시가'),
+        ),
+    ]
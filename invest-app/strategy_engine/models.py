@@ -3,19 +3,29 @@ from django.db import models
 class HistoricalPrice(models.Model):
     """
     백테스팅을 위한 종목별 과거 시세 데이터를 저장하는 모델.
+    가격은 고정 폭 double precision으로 저장하여 행 크기와 집계/로딩 비용을 줄입니다.
+    (코스피 지수처럼 소수점이 있는 값도 함께 저장하므로 정수형 대신 float를 사용합니다.)
     """
-    symbol = models.CharField(max_length=20, db_index=True, help_text="종목 코드")
-    date = models.DateField(db_index=True, help_text="날짜")
-    open_price = models.DecimalField(max_digits=12, decimal_places=2, help_text="시가")
-    high_price = models.DecimalField(max_digits=12, decimal_places=2, help_text="고가")
-    low_price = models.DecimalField(max_digits=12, decimal_places=2, help_text="저가")
-    close_price = models.DecimalField(max_digits=12, decimal_places=2, help_text="종가")
+    symbol = models.CharField(max_length=20, help_text="종목 코드")
+    date = models.DateField(help_text="날짜")
+    open_price = models.FloatField(help_text="시가")
+    high_price = models.FloatField(help_text="고가")
+    low_price = models.FloatField(help_text="저가")
+    close_price = models.FloatField(help_text="종가")
     volume = models.BigIntegerField(help_text="거래량")
 
     class Meta:
         verbose_name = "과거 시세 데이터"
         verbose_name_plural = "과거 시세 데이터"
         unique_together = ('symbol', 'date') # 종목과 날짜의 조합은 유일해야 함
+        indexes = [
+            # 백테스트의 '종목 + 기간' 조회를 테이블 접근 없이 처리하는 커버링 인덱스 (PostgreSQL)
+            models.Index(
+                fields=['symbol', 'date'],
+                include=['open_price', 'high_price', 'low_price', 'close_price', 'volume'],
+                name='hp_sym_date_cov',
+            ),
+        ]
         ordering = ['-date']
 
     def __str__(self):
@@ -1,13 +1,25 @@
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 from decimal import Decimal
-from trading.kis_client import KISApiClient
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from trading.kis_client import KISApiClient, RateLimiter
 from trading.models import TradingAccount, AnalyzedStock
-from .filters import is_financially_sound, is_blue_chip
-from .technical_analysis import calculate_atr, get_price_targets
+from .filters import build_financial_features, screen_financially_sound, screen_blue_chip
+from .technical_analysis import calculate_atr_batch, get_price_targets, stack_hlc_arrays, to_hlc_array
 
 logger = logging.getLogger(__name__)
 
+# 스크리닝 결과로 갱신하는 AnalyzedStock 필드 (bulk_update 대상)
+SCREENED_STOCK_FIELDS = ['stock_name', 'is_investable', 'investment_horizon', 'analysis_date', 'last_price', 'raw_analysis_data']
+# bulk_update/bulk_create 한 번에 처리하는 행 수
+SCREENED_STOCK_BATCH_SIZE = 1000
+# 자주 바뀌지 않는 종목 데이터의 캐시 유효 시간 (초)
+STOCK_INFO_CACHE_TIMEOUT = 60 * 60 * 24  # 기본 정보(상장주식수, 업종 등): 1일
+FINANCIAL_INFO_CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 재무비율: 1주
+
 class UniverseScreener:
     """
     전체 상장 종목을 대상으로 유니버스 필터링 로직을 수행하고,
@@ -40,10 +52,11 @@ class UniverseScreener:
             logger.error(f"KISApiClient 초기화 중 에러 발생: {e}")
             raise
 
-    def screen_all_stocks(self, api_delay=0.5):
+    def screen_all_stocks(self, max_workers=8, calls_per_second=10):
         """
         전체 종목을 대상으로 스크리닝을 실행하고 결과를 DB에 저장합니다.
-        API 호출 제한을 피하기 위해 각 종목 처리 후 지연 시간을 둡니다.
+        종목별 데이터는 여러 스레드에서 동시에 수집하되, API 호출 제한을 넘지 않도록
+        모든 스레드가 하나의 RateLimiter를 공유하여 초당 호출 수를 맞춥니다.
         """
         logger.info("전체 종목 스크리닝을 시작합니다.")
 
@@ -54,104 +67,174 @@ class UniverseScreener:
             return 0
         all_symbols = list(all_stocks_map.keys())
 
-        logger.info(f"총 {len(all_symbols)}개의 종목을 대상으로 스크리닝을 진행합니다.")
-
-        screened_count = 0
-        for i, symbol in enumerate(all_symbols):
+        logger.info("총 %d개의 종목을 대상으로 스크리닝을 진행합니다.", len(all_symbols))
+
+        # 2. 종목별 데이터 동시 수집
+        self.client.rate_limiter = RateLimiter(calls_per_second)
+        # 토큰은 스레드 시작 전에 한 번만 발급
+        self.client.get_access_token()
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._fetch_stock_data, symbol, all_stocks_map): symbol for symbol in all_symbols}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    candidate = future.result()
+                    if candidate:
+                        fetched[symbol] = candidate
+                except Exception as e:
+                    logger.error("[%s] 스크리닝 중 예외 발생: %s", symbol, e, exc_info=True)
+        # 완료 순서와 관계없이 종목 코드 순서를 유지
+        candidates = [fetched[symbol] for symbol in all_symbols if symbol in fetched]
+
+        # 3. 필터링 로직을 수집된 전체 종목에 대해 한 번에 실행
+        features = build_financial_features((c['stock_details'], c['financial_data']) for c in candidates)
+        sound_mask, sound_reasons = screen_financially_sound(features)
+        blue_mask, blue_reasons = screen_blue_chip(features)
+
+        # 4. 통과 종목의 ATR을 (일자, 종목) 배열 한 번의 연산으로 계산
+        passed = [c for c, is_sound in zip(candidates, sound_mask) if is_sound]
+        atrs = dict(zip(
+            (c['symbol'] for c in passed),
+            calculate_atr_batch(*stack_hlc_arrays([c['history'] for c in passed]), period=14).tolist(),
+        ))
+
+        # 5. 기존 분석 결과를 한 번에 조회한 뒤, 갱신/신규 대상을 나누어 일괄 저장
+        passed_symbols = list(atrs)
+        existing = AnalyzedStock.objects.in_bulk(passed_symbols, field_name='symbol')
+        to_update, to_create = [], []
+        for candidate, is_sound, reason_sound, is_blue, reason_blue in zip(
+                candidates, sound_mask, sound_reasons, blue_mask, blue_reasons):
+            symbol = candidate['symbol']
+            if not is_sound:
+                logger.debug("[%s] '일반' 종목 필터링 실패: %s", symbol, reason_sound)
+                continue
             try:
-                # API 호출 지연
-                time.sleep(api_delay)
-
-                # 2. 필요한 데이터 수집
-                # get_stock_info가 가장 많은 정보를 주므로 먼저 호출
-                info_res = self.client.get_stock_info(symbol)
-                if not (info_res and info_res.is_ok()):
-                    logger.debug(f"[{symbol}] 기본 정보 수집 실패. 건너뜁니다.")
-                    continue
-                stock_info = info_res.get_body().get('output', {})
-
-                price_res = self.client.get_current_price(symbol)
-                fin_res = self.client.get_financial_info(symbol)
-                history_res = self.client.get_daily_price_history(symbol, days=30) # 20일 평균 거래대금 계산용
-
-                if not (price_res and price_res.is_ok() and fin_res and fin_res.is_ok() and history_res and history_res.is_ok()):
-                    logger.warning(f"[{symbol}] 추가 데이터(가격/재무/히스토리) 수집 실패. 건너뜁니다.")
-                    continue
-
-                price_data = price_res.get_body().get('output', {})
-                financial_data = fin_res.get_body().get('output', [])
-                history_data = history_res.get_body().get('output2', [])
-
-                # 3. 필터링에 필요한 데이터 가공
-                # 20일 평균 거래대금 계산
-                if len(history_data) >= 20:
-                    avg_20d_turnover = sum(int(d['acml_tr_pbmn']) for d in history_data[-20:]) / 20
-                else:
-                    avg_20d_turnover = 0 # 데이터 부족 시 0으로 처리
-
-                # 시가총액 계산
-                listed_shares = int(stock_info.get('stck_iss_cnt', '0'))
-                current_price = int(price_data.get('stck_prpr', '0'))
-                market_cap = listed_shares * current_price
-
-                stock_details = {
-                    'symbol': symbol,
-                    'stock_name': stock_info.get('prdt_abrv_name', all_stocks_map.get(symbol, '')),
-                    'avg_20d_turnover': avg_20d_turnover,
-                    'market_cap': market_cap,
-                    'sector_code': stock_info.get('bstp_larg_div_code'),
-                    'is_admin_issue': price_data.get('admd_item_yn', 'N') == 'Y',
-                    'is_investment_alert': any(price_data.get(key, 'N') == 'Y' for key in ['invt_alrm_yn', 'invt_atn_yn', 'invt_dngr_yn']),
-                    'is_capital_impaired': stock_info.get('cpta_eros_yn', 'N') == 'Y',
-                }
-
-                # 4. 필터링 로직 실행
-                is_sound, reason_sound = is_financially_sound(stock_details, financial_data)
-                if not is_sound:
-                    logger.debug(f"[{symbol}] '일반' 종목 필터링 실패: {reason_sound}")
-                    continue
-
-                is_blue, reason_blue = is_blue_chip(stock_details, financial_data)
-
-                investment_horizon = '일반'
-                if is_blue:
-                    investment_horizon = '중/장기'
-
-                # 5. ATR 및 목표/손절가 계산
-                price_targets = {}
-                daily_history_res = self.client.get_daily_price_history(symbol, days=30)
-                if daily_history_res and daily_history_res.is_ok():
-                    daily_history = daily_history_res.get_body().get('output2', [])
-                    current_price = float(price_data.get('stck_prpr', '0'))
-
-                    atr = calculate_atr(daily_history, period=14)
-                    if atr > 0:
-                        # 매수가는 현재가로 가정하여 계산
-                        price_targets = get_price_targets(atr, current_price, current_price, investment_horizon)
-
-                # 6. 분석 결과 데이터베이스에 저장/업데이트
-                AnalyzedStock.objects.update_or_create(
-                    symbol=symbol,
-                    defaults={
-                        'stock_name': stock_details['stock_name'],
-                        'is_investable': True,
-                        'investment_horizon': investment_horizon,
-                        'last_price': Decimal(price_data.get('stck_prpr', '0')),
-                        'raw_analysis_data': {
-                            'filter_sound_reason': reason_sound,
-                            'filter_blue_chip_reason': reason_blue,
-                            'details': stock_details,
-                            'financials': financial_data,
-                            'atr': atr,
-                            'price_targets': price_targets
-                        }
-                    }
-                )
-                screened_count += 1
-                logger.info(f"[{symbol}] 스크리닝 통과. 등급: {investment_horizon}, ATR: {atr:.2f}, 목표가: {price_targets}")
-
+                stock = existing.get(symbol) or AnalyzedStock(symbol=symbol)
+                self._apply_screening_result(stock, candidate, atrs[symbol], str(reason_sound), bool(is_blue), str(reason_blue))
+                (to_update if stock.pk else to_create).append(stock)
             except Exception as e:
-                logger.error(f"[{symbol}] 스크리닝 중 예외 발생: {e}", exc_info=True)
+                logger.error("[%s] 스크리닝 중 예외 발생: %s", symbol, e, exc_info=True)
 
-        logger.info(f"종목 스크리닝 완료. 총 {len(all_symbols)}개 중 {screened_count}개 종목이 유니버스에 포함되었습니다.")
-        return screened_count
\ No newline at end of file
+        with transaction.atomic():
+            AnalyzedStock.objects.bulk_update(to_update, SCREENED_STOCK_FIELDS, batch_size=SCREENED_STOCK_BATCH_SIZE)
+            AnalyzedStock.objects.bulk_create(to_create, batch_size=SCREENED_STOCK_BATCH_SIZE, ignore_conflicts=True)
+        screened_count = len(to_update) + len(to_create)
+
+        logger.info("종목 스크리닝 완료. 총 %d개 중 %d개 종목이 유니버스에 포함되었습니다.", len(all_symbols), screened_count)
+        return screened_count
+
+    def _fetch_stock_data(self, symbol, all_stocks_map):
+        """
+        종목 1개의 기본 정보/현재가/재무/시세 데이터를 수집하여 필터 입력값을 만듭니다.
+        수집에 실패하면 None을 반환합니다.
+        """
+        # get_stock_info가 가장 많은 정보를 주므로 먼저 호출
+        stock_info = self._get_cached_output(
+            f"kis:info:{symbol}", STOCK_INFO_CACHE_TIMEOUT, self.client.get_stock_info, symbol, default={})
+        if stock_info is None:
+            logger.debug("[%s] 기본 정보 수집 실패. 건너뜁니다.", symbol)
+            return None
+
+        price_res = self.client.get_current_price(symbol)
+        financial_data = self._get_cached_output(
+            f"kis:fin:{symbol}", FINANCIAL_INFO_CACHE_TIMEOUT, self.client.get_financial_info, symbol, default=[])
+        history_res = self.client.get_daily_price_history(symbol, days=30) # 20일 평균 거래대금 계산용
+
+        if not (price_res and price_res.is_ok() and financial_data is not None and history_res and history_res.is_ok()):
+            logger.warning("[%s] 추가 데이터(가격/재무/히스토리) 수집 실패. 건너뜁니다.", symbol)
+            return None
+
+        price_data = price_res.get_body().get('output', {})
+        # 거래대금과 ATR 계산에 함께 쓰도록 일봉을 한 번만 NumPy 배열로 변환
+        daily_history = history_res.get_body().get('output2', [])
+        try:
+            history = to_hlc_array(daily_history, with_turnover=True)
+            turnover = history['turnover']
+        except (KeyError, ValueError, TypeError) as e:
+            # 가격 필드가 잘못된 종목도 제외하지 않고 ATR 0으로 처리하며, 거래대금만 따로 변환
+            logger.warning("[%s] 일봉 가격 변환 실패로 ATR을 0으로 처리합니다: %s", symbol, e)
+            history = to_hlc_array([], with_turnover=True)
+            turnover = np.asarray([d['acml_tr_pbmn'] for d in daily_history], dtype=np.int64)
+
+        # 필터링에 필요한 데이터 가공
+        # 20일 평균 거래대금 계산
+        if len(turnover) >= 20:
+            avg_20d_turnover = float(turnover[-20:].mean())
+        else:
+            avg_20d_turnover = 0 # 데이터 부족 시 0으로 처리
+
+        # 시가총액 계산
+        listed_shares = int(stock_info.get('stck_iss_cnt', '0'))
+        current_price = int(price_data.get('stck_prpr', '0'))
+        market_cap = listed_shares * current_price
+
+        stock_details = {
+            'symbol': symbol,
+            'stock_name': stock_info.get('prdt_abrv_name', all_stocks_map.get(symbol, '')),
+            'avg_20d_turnover': avg_20d_turnover,
+            'market_cap': market_cap,
+            'sector_code': stock_info.get('bstp_larg_div_code'),
+            'is_admin_issue': price_data.get('admd_item_yn', 'N') == 'Y',
+            'is_investment_alert': any(price_data.get(key, 'N') == 'Y' for key in ['invt_alrm_yn', 'invt_atn_yn', 'invt_dngr_yn']),
+            'is_capital_impaired': stock_info.get('cpta_eros_yn', 'N') == 'Y',
+        }
+        return {
+            'symbol': symbol,
+            'stock_details': stock_details,
+            'financial_data': financial_data,
+            'price_data': price_data,
+            'history': history,
+        }
+
+    def _get_cached_output(self, key, timeout, fetch, symbol, default):
+        """
+        캐시에 저장된 API 응답의 'output'을 반환합니다.
+        캐시에 없으면 fetch(symbol)로 조회한 뒤 timeout 동안 저장하며, 조회에 실패하면 None을 반환합니다.
+        """
+        output = cache.get(key)
+        if output is not None:
+            return output
+
+        res = fetch(symbol)
+        if not (res and res.is_ok()):
+            return None
+        output = res.get_body().get('output', default)
+        cache.set(key, output, timeout)
+        return output
+
+    def _apply_screening_result(self, stock, candidate, atr, reason_sound, is_blue, reason_blue):
+        """
+        필터를 통과한 종목의 ATR과 목표가를 AnalyzedStock 인스턴스에 반영합니다.
+        저장은 호출하는 쪽에서 bulk_update/bulk_create로 일괄 처리합니다.
+        """
+        symbol = candidate['symbol']
+        stock_details = candidate['stock_details']
+        price_data = candidate['price_data']
+
+        investment_horizon = '일반'
+        if is_blue:
+            investment_horizon = '중/장기'
+
+        # 목표/손절가 계산 (ATR은 수집 단계에서 받은 30일 시세로 일괄 계산됨)
+        price_targets = {}
+        current_price = float(price_data.get('stck_prpr', '0'))
+        if atr > 0:
+            # 매수가는 현재가로 가정하여 계산
+            price_targets = get_price_targets(atr, current_price, current_price, investment_horizon)
+
+        # 분석 결과 반영 (bulk_update는 auto_now를 채우지 않으므로 분석일도 직접 설정)
+        stock.stock_name = stock_details['stock_name']
+        stock.is_investable = True
+        stock.investment_horizon = investment_horizon
+        stock.analysis_date = date.today()
+        stock.last_price = Decimal(price_data.get('stck_prpr', '0'))
+        stock.raw_analysis_data = {
+            'filter_sound_reason': reason_sound,
+            'filter_blue_chip_reason': reason_blue,
+            'details': stock_details,
+            'financials': candidate['financial_data'],
+            'atr': atr,
+            'price_targets': price_targets
+        }
+        logger.info("[%s] 스크리닝 통과. 등급: %s, ATR: %.2f, 목표가: %s", symbol, investment_horizon, atr, price_targets)
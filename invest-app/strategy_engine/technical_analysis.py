@@ -1,49 +1,121 @@
-import pandas as pd
+import numpy as np
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
-def calculate_atr(daily_price_history: list, period: int = 14) -> float:
+# KIS 일봉 응답에서 ATR 계산에 필요한 (고가, 저가, 종가) 구조체 배열 형식
+HLC_DTYPE = np.dtype([('h', 'f8'), ('l', 'f8'), ('c', 'f8')])
+# 거래대금('acml_tr_pbmn')까지 포함한 형식
+HLCT_DTYPE = np.dtype([('h', 'f8'), ('l', 'f8'), ('c', 'f8'), ('turnover', 'i8')])
+
+
+def to_hlc_array(daily_price_history: list, with_turnover: bool = False) -> np.ndarray:
+    """
+    KIS API 일봉 output2 리스트를 (고가, 저가, 종가) float64 구조체 배열로 변환합니다.
+    with_turnover가 True이면 거래대금('turnover') 필드도 함께 채웁니다.
+    가격 문자열은 항목마다 float()를 호출하지 않고, 컬럼별 문자열 리스트를 NumPy가 C 루프에서 한 번에 변환합니다.
+    """
+    dtype = HLCT_DTYPE if with_turnover else HLC_DTYPE
+    arr = np.empty(len(daily_price_history), dtype=dtype)
+    arr['h'] = np.asarray([d['stck_hgpr'] for d in daily_price_history], dtype=np.float64)
+    arr['l'] = np.asarray([d['stck_lwpr'] for d in daily_price_history], dtype=np.float64)
+    arr['c'] = np.asarray([d['stck_clpr'] for d in daily_price_history], dtype=np.float64)
+    if with_turnover:
+        arr['turnover'] = np.asarray([d['acml_tr_pbmn'] for d in daily_price_history], dtype=np.int64)
+    return arr
+
+
+@lru_cache(maxsize=64)
+def _ewm_weights(length: int, period: int):
+    """
+    EWM(alpha=1/period, adjust=True)의 최신 값을 가중 평균으로 구하기 위한
+    가중치 벡터(오래된 일자 -> 최신 일자 순)와 그 합을 반환합니다.
+    같은 (길이, 기간)에 대해서는 한 번만 만들어 재사용합니다.
+    """
+    weights = (1 - 1 / period) ** np.arange(length - 1, -1, -1)
+    weights.flags.writeable = False
+    return weights, float(weights.sum())
+
+
+def calculate_atr(daily_price_history, period: int = 14) -> float:
     """
     일봉 데이터 리스트를 기반으로 ATR(Average True Range)을 계산합니다.
 
     Args:
-        daily_price_history (list): KIS API의 'inquire-daily-itemchartprice' 결과의
+        daily_price_history (list | np.ndarray): KIS API의 'inquire-daily-itemchartprice' 결과의
                                    output2 리스트. 각 항목은 dict 형태여야 합니다.
                                    (필수 키: 'stck_hgpr', 'stck_lwpr', 'stck_clpr')
+                                   to_hlc_array()로 변환한 구조체 배열도 받을 수 있습니다.
         period (int): ATR 계산에 사용할 기간. 기본값은 14일입니다.
 
     Returns:
         float: 계산된 최신 ATR 값. 계산이 불가능하면 0.0을 반환합니다.
     """
-    if not daily_price_history or len(daily_price_history) < period:
-        logger.warning(f"ATR 계산을 위한 데이터 부족. 데이터 개수: {len(daily_price_history)}, 필요 기간: {period}")
+    count = 0 if daily_price_history is None else len(daily_price_history)
+    if count == 0 or count < period:
+        logger.warning("ATR 계산을 위한 데이터 부족. 데이터 개수: %d, 필요 기간: %d", count, period)
         return 0.0
 
     try:
-        # KIS API 응답(string)을 float으로 변환하여 DataFrame 생성
-        df = pd.DataFrame(daily_price_history)
-        df['high'] = df['stck_hgpr'].astype(float)
-        df['low'] = df['stck_lwpr'].astype(float)
-        df['close'] = df['stck_clpr'].astype(float)
-
-        # True Range(TR) 계산
-        df['tr1'] = abs(df['high'] - df['low'])
-        df['tr2'] = abs(df['high'] - df['close'].shift(1))
-        df['tr3'] = abs(df['low'] - df['close'].shift(1))
-        df['tr'] = df[['tr1', 'tr2', 'tr3']].max(axis=1)
-
-        # ATR 계산 (Exponential Moving Average 사용)
-        df['atr'] = df['tr'].ewm(alpha=1/period, adjust=True).mean()
+        # KIS API 응답(string)을 float64 구조체 배열로 변환
+        arr = daily_price_history if isinstance(daily_price_history, np.ndarray) else to_hlc_array(daily_price_history)
+        # True Range (fmax는 NaN을 무시하므로 전일 종가가 없는 첫날은 고가-저가)
+        high, low, close = arr['h'], arr['l'], arr['c']
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
 
-        # 최신 ATR 값 반환
-        latest_atr = df['atr'].iloc[-1]
-        return float(latest_atr)
+        # ATR 계산 (EWM adjust=True의 최신 값 = 미리 만든 가중치 벡터와의 내적 한 번)
+        weights, weight_sum = _ewm_weights(len(tr), period)
+        return float(np.dot(weights, tr) / weight_sum)
 
     except (KeyError, ValueError, TypeError) as e:
-        logger.error(f"ATR 계산 중 오류 발생: {e}", exc_info=True)
+        logger.error("ATR 계산 중 오류 발생: %s", e, exc_info=True)
         return 0.0
 
+def stack_hlc_arrays(histories):
+    """
+    종목별 to_hlc_array() 결과를 (T, S) 고가/저가/종가 배열로 쌓습니다.
+    종목별 데이터 길이가 다르면 최신 일자에 맞춰 오른쪽 정렬하고 앞쪽은 NaN으로 채웁니다.
+    """
+    length = max((len(h) for h in histories), default=0)
+    high, low, close = (np.full((length, len(histories)), np.nan) for _ in range(3))
+    for col, history in enumerate(histories):
+        if len(history):
+            high[length - len(history):, col] = history['h']
+            low[length - len(history):, col] = history['l']
+            close[length - len(history):, col] = history['c']
+    return high, low, close
+
+
+def calculate_atr_batch(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    여러 종목의 ATR을 종목 축으로 벡터화하여 한 번에 계산합니다. calculate_atr와 같은 값을 반환합니다.
+
+    Args:
+        high, low, close (np.ndarray): (T, S) 배열. 데이터가 없는 앞쪽 행은 NaN (stack_hlc_arrays 참고).
+        period (int): ATR 계산에 사용할 기간.
+
+    Returns:
+        np.ndarray: 종목별 최신 ATR (S,). 데이터가 period보다 적은 종목은 0.0.
+    """
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    # fmax는 NaN을 무시하므로, 전일 종가가 없는 첫 유효 행은 고가-저가가 됩니다.
+    tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
+    valid = ~np.isnan(tr)
+
+    # EWM(adjust=True)의 최신 값 = 최신 행부터 (1 - 1/period)^k 가중 평균
+    decay, _ = _ewm_weights(len(tr), period)
+    weights = decay[:, None] * valid
+    numerator = (np.where(valid, tr, 0.0) * weights).sum(axis=0)
+    denominator = weights.sum(axis=0)
+
+    atr = np.zeros(tr.shape[1])
+    enough = valid.sum(axis=0) >= period
+    atr[enough] = numerator[enough] / denominator[enough]
+    return atr
+
+
 def get_price_targets(atr: float, buy_price: float, current_price: float, group: str):
     """
     종목 그룹('일반' 또는 '중/장기')에 따라 목표가와 손절가를 계산합니다.
@@ -87,4 +159,4 @@ def get_price_targets(atr: float, buy_price: float, current_price: float, group:
         }
 
     else:
-        return {'target_price': None, 'stop_loss_price': None}
\ No newline at end of file
+        return {'target_price': None, 'stop_loss_price': None}
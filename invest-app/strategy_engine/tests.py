@@ -1,6 +1,10 @@
+from decimal import Decimal
+
 from django.test import TestCase
 import pandas as pd
-from strategy_engine.technical_analysis import calculate_atr
+from strategy_engine.technical_analysis import (
+    calculate_atr, calculate_atr_batch, get_price_targets, stack_hlc_arrays, to_hlc_array,
+)
 
 class TechnicalAnalysisTest(TestCase):
     def setUp(self):
@@ -51,8 +55,38 @@ class TechnicalAnalysisTest(TestCase):
         # Assert that the function's output is no longer the incorrect, unadjusted value
         self.assertNotEqual(atr_from_function, incorrect_atr)
 
+    def test_calculate_atr_batch_matches_per_symbol_atr(self):
+        """
+        Tests that the batched ATR matches calculate_atr for symbols with
+        different history lengths, and is 0.0 when there are too few bars.
+        """
+        histories = [
+            to_hlc_array(self.daily_price_history),
+            to_hlc_array(self.daily_price_history[:14]),
+            to_hlc_array(self.daily_price_history[:10]),
+        ]
+        atrs = calculate_atr_batch(*stack_hlc_arrays(histories), period=14)
+
+        self.assertAlmostEqual(atrs[0], calculate_atr(self.daily_price_history, period=14))
+        self.assertAlmostEqual(atrs[1], calculate_atr(self.daily_price_history[:14], period=14))
+        self.assertEqual(atrs[2], 0.0)
+
+    def test_get_price_targets(self):
+        """
+        Tests the fixed target and stop loss for '일반' stocks, and that the
+        trailing stop moves up with the current price for '중/장기' stocks.
+        """
+        self.assertEqual(
+            get_price_targets(100.0, 10000.0, 10000.0, '일반'),
+            {'target_price': 10400.0, 'stop_loss_price': 9800.0},
+        )
+        # 초기 손절가(9700)가 샹들리에 청산가(9400)보다 높음
+        self.assertEqual(get_price_targets(100.0, 10000.0, 9700.0, '중/장기')['stop_loss_price'], 9700.0)
+        # 현재가 상승 시 트레일링 스탑이 함께 상승
+        self.assertEqual(get_price_targets(100.0, 10000.0, 12000.0, '중/장기')['stop_loss_price'], 11700.0)
 
-from .filters import determine_market_mode
+
+from strategy_engine.filters import determine_market_mode, is_blue_chip, is_financially_sound
 
 class MarketModeTest(TestCase):
     def test_determine_market_mode(self):
@@ -77,4 +111,290 @@ class MarketModeTest(TestCase):
 
         # 4. Assert the correct modes are returned
         self.assertEqual(mode_dca, '우량주 분할매수 모드')
-        self.assertEqual(mode_trading, '단기 트레이딩 모드')
\ No newline at end of file
+        self.assertEqual(mode_trading, '단기 트레이딩 모드')
+
+
+SOUND_DETAILS = {
+    'stock_name': '테스트전자', 'avg_20d_turnover': 6_000_000_000, 'market_cap': 200_000_000_000, 'sector_code': '10',
+}
+SOUND_YEAR = {'debt_ratio': '150', 'interest_coverage_ratio': '5', 'roe': '8', 'operating_profit': '100'}
+
+
+def blue_chip_year(bz_yy, sales, eps, **overrides):
+    return {
+        'bz_yy': bz_yy, 'debt_ratio': '50', 'current_ratio': '200', 'roe': '15', 'operating_margin': '12',
+        'dividend_per_share': '500', 'sales': sales, 'eps': eps, **overrides,
+    }
+
+
+# API 응답 순서 (최신 연도가 먼저), 매출/EPS 모두 연 10% 성장
+BLUE_CHIP_YEARS = [
+    blue_chip_year('2024', '1331', '13310'),
+    blue_chip_year('2023', '1210', '12100'),
+    blue_chip_year('2022', '1100', '11000'),
+    blue_chip_year('2021', '1000', '10000'),
+]
+
+
+def with_year(financial_data, index, **overrides):
+    return [{**d, **overrides} if i == index else d for i, d in enumerate(financial_data)]
+
+
+class FinancialFilterTest(TestCase):
+    def test_is_financially_sound(self):
+        """
+        Tests the pass flag and the reason of each check of is_financially_sound,
+        including invalid values, which only count once their check is reached.
+        """
+        three_years = [SOUND_YEAR] * 3
+        finance = {**SOUND_DETAILS, 'sector_code': '64'}
+        cases = [
+            ('pass', SOUND_DETAILS, three_years, (True, "통과")),
+            ('turnover', {**SOUND_DETAILS, 'avg_20d_turnover': 4_000_000_000}, three_years, (False, "거래대금 미달")),
+            ('market cap', {**SOUND_DETAILS, 'market_cap': 90_000_000_000}, three_years, (False, "시가총액 미달")),
+            ('admin issue', {**SOUND_DETAILS, 'is_admin_issue': True}, three_years,
+             (False, "관리/경고 종목 또는 자본잠식")),
+            ('spac', {**SOUND_DETAILS, 'stock_name': '하나스팩1호'}, three_years, (False, "스팩 또는 지주사 제외")),
+            ('holding', {**SOUND_DETAILS, 'stock_name': '테스트지주'}, three_years, (False, "스팩 또는 지주사 제외")),
+            ('debt ratio', SOUND_DETAILS, with_year(three_years, 0, debt_ratio='250.5'),
+             (False, "부채비율 초과 (250.5%)")),
+            ('no financials', SOUND_DETAILS, [], (False, "부채비율 초과 (9999%)")),
+            ('finance sector debt ratio', finance, with_year(three_years, 0, debt_ratio='900'), (True, "통과")),
+            ('finance sector invalid debt ratio', finance, with_year(three_years, 0, debt_ratio=''), (True, "통과")),
+            ('invalid debt ratio', SOUND_DETAILS, with_year(three_years, 0, debt_ratio=''), (False, "데이터 오류")),
+            ('interest coverage', SOUND_DETAILS, with_year(three_years, 0, interest_coverage_ratio='2.5'),
+             (False, "이자보상배율 미달 (2.5)")),
+            ('roe', SOUND_DETAILS, with_year(three_years, 0, roe='4.50'), (False, "ROE 미달 (4.50%)")),
+            ('invalid roe', SOUND_DETAILS, with_year(three_years, 0, roe=None), (False, "데이터 오류")),
+            ('invalid roe after failed check', SOUND_DETAILS,
+             with_year(with_year(three_years, 0, roe=None), 0, interest_coverage_ratio='1'),
+             (False, "이자보상배율 미달 (1)")),
+            ('operating profit', SOUND_DETAILS,
+             with_year(with_year(three_years, 1, operating_profit='-10'), 2, operating_profit='0'),
+             (False, "영업이익 흑자 조건 미달")),
+            ('invalid operating profit', SOUND_DETAILS, with_year(three_years, 2, operating_profit=None),
+             (False, "데이터 오류")),
+            ('fourth year is ignored', SOUND_DETAILS,
+             with_year(three_years, 1, operating_profit='-10') + [{**SOUND_YEAR, 'operating_profit': None}],
+             (True, "통과")),
+        ]
+        for name, details, financial_data, expected in cases:
+            with self.subTest(name):
+                self.assertEqual(is_financially_sound(details, financial_data), expected)
+
+    def test_is_blue_chip(self):
+        """
+        Tests the pass flag and the reason of each check of is_blue_chip,
+        including short histories, invalid values and unsorted business years.
+        """
+        years = BLUE_CHIP_YEARS
+        # 연도 순서가 섞여 있어도 2021 -> 2024 기준으로 성장률을 계산 (매출 1000 -> 1100)
+        unsorted_low_sales = [
+            blue_chip_year('2023', '2000', '12100'),
+            blue_chip_year('2021', '1000', '10000'),
+            blue_chip_year('2024', '1100', '13310'),
+            blue_chip_year('2022', '900', '11000'),
+        ]
+        cases = [
+            ('pass', years, (True, "통과")),
+            ('unsorted years', [years[2], years[0], years[3], years[1]], (True, "통과")),
+            ('fewer than 3 years', years[:2], (False, "3년치 재무 데이터 부족")),
+            ('debt ratio', with_year(years, 0, debt_ratio='100'), (False, "부채비율 100% 이상")),
+            ('current ratio', with_year(years, 0, current_ratio='149.9'), (False, "유동비율 150% 미만")),
+            ('average roe', with_year(years, 1, roe='3'), (False, "3년 평균 ROE 미달 (11.00%)")),
+            ('average operating margin', with_year(years, 2, operating_margin='3'),
+             (False, "3년 평균 영업이익률 미달 (9.00%)")),
+            ('fewer than 4 years', years[:3], (False, "4년치 재무 데이터 부족 (CAGR 계산 불가)")),
+            ('missing year', with_year(years, 2, bz_yy=''), (False, "재무 데이터 연도 정보 오류")),
+            ('invalid year', with_year(years, 2, bz_yy=None), (False, "데이터 오류")),
+            ('sales growth with unsorted years', unsorted_low_sales, (False, "3년 연평균 매출 성장률 미달 (3.23%)")),
+            ('eps growth', with_year(years, 0, eps='10000'), (False, "3년 연평균 EPS 성장률 미달 (0.00%)")),
+            ('dividend', with_year(years, 1, dividend_per_share='0'), (False, "3년 연속 배당 미실시")),
+            ('invalid current ratio', with_year(years, 0, current_ratio=None), (False, "데이터 오류")),
+            ('invalid roe', with_year(years, 2, roe=None), (False, "데이터 오류")),
+            ('invalid sales', with_year(years, 3, sales=None), (False, "데이터 오류")),
+            ('invalid dividend', with_year(years, 2, dividend_per_share=None), (False, "데이터 오류")),
+            ('invalid dividend after missing dividend', with_year(with_year(years, 2, dividend_per_share=None), 1,
+                                                                  dividend_per_share='0'),
+             (False, "3년 연속 배당 미실시")),
+        ]
+        for name, financial_data, expected in cases:
+            with self.subTest(name):
+                self.assertEqual(is_blue_chip(SOUND_DETAILS, financial_data), expected)
+
+import multiprocessing
+import shutil
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from trading.models import AnalyzedStock, TradingAccount
+from strategy_engine.backtest import Backtester, load_history_data, run_parameter_sweep
+from strategy_engine.historical_cache import read_cached_history
+from strategy_engine.models import HistoricalPrice
+
+HISTORY_SYMBOLS = ['005930', '000660', '0001']
+HISTORY_DATES = [d.date() for d in pd.bdate_range('2024-01-01', '2024-01-31')]
+
+
+def create_price_history():
+    HistoricalPrice.objects.bulk_create([
+        HistoricalPrice(
+            symbol=symbol, date=day,
+            open_price=1000.0 * (i + 1), high_price=1000.0 * (i + 1) + 50 + n,
+            low_price=1000.0 * (i + 1) - 50, close_price=1000.0 * (i + 1) + 10 * n, volume=100 + n,
+        )
+        for n, day in enumerate(HISTORY_DATES)
+        for i, symbol in enumerate(HISTORY_SYMBOLS)
+    ])
+
+
+class HistoricalCacheTest(TestCase):
+    def setUp(self):
+        self.cache_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_root, ignore_errors=True)
+        settings_override = override_settings(HISTORICAL_PRICE_CACHE_DIR=f"{self.cache_root}/historical_prices")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        create_price_history()
+
+    def test_read_cached_history_round_trip(self):
+        """
+        Tests that the Parquet cache returns the same rows as the DB for the
+        requested period, keeping the leading zeros of the symbol codes.
+        """
+        start, end = date(2024, 1, 8), date(2024, 1, 19)
+        df = read_cached_history(start, end)
+
+        expected = pd.DataFrame.from_records(
+            HistoricalPrice.objects.filter(date__range=(start, end)).order_by('date', 'symbol')
+            .values_list('date', 'symbol', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'),
+            columns=list(df.columns),
+        )
+        self.assertEqual(set(df['symbol']), set(HISTORY_SYMBOLS))
+        self.assertEqual(df['date'].min(), pd.Timestamp(start))
+        self.assertEqual(df['date'].max(), pd.Timestamp(end))
+        self.assertTrue(df['date'].is_monotonic_increasing)
+
+        actual = df.sort_values(['date', 'symbol']).reset_index(drop=True)
+        self.assertEqual(actual['date'].dt.date.tolist(), expected['date'].tolist())
+        self.assertEqual(actual['symbol'].tolist(), expected['symbol'].tolist())
+        for column in ['open_price', 'high_price', 'low_price', 'close_price', 'volume']:
+            self.assertEqual(actual[column].tolist(), expected[column].tolist())
+
+    def test_read_cached_history_outside_range_is_empty(self):
+        self.assertTrue(read_cached_history(date(2023, 1, 1), date(2023, 12, 31)).empty)
+
+
+class ParameterSweepTest(TestCase):
+    def setUp(self):
+        self.cache_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_root, ignore_errors=True)
+        settings_override = override_settings(HISTORICAL_PRICE_CACHE_DIR=f"{self.cache_root}/historical_prices")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        create_price_history()
+
+        self.user = User.objects.create_user('sweepuser', 'sweep@example.com', 'password')
+        TradingAccount.objects.create(
+            user=self.user, account_name='Sweep', account_number='87654321-01', app_key='key', app_secret='secret',
+        )
+        # 매일 상승하는 종목 하나만 매수 후보로 두어, 리스크 비율에 따라 매수 수량과 최종 평가금액이 달라지게 합니다.
+        AnalyzedStock.objects.create(
+            symbol='005930', stock_name='Samsung Electronics', is_investable=True,
+            investment_horizon='일반', last_price=Decimal('1000'), raw_analysis_data={'atr': '20'},
+        )
+        self.start, self.end = HISTORY_DATES[0], HISTORY_DATES[-1]
+
+    def test_run_parameter_sweep_matches_sequential_backtests(self):
+        """
+        Tests that the parallel sweep returns one summary per parameter set in
+        param_grid order, with the same values as running each backtest directly.
+        """
+        # 병렬 테스트(--parallel)의 워커는 데몬 프로세스라 하위 프로세스 풀을 만들 수 없습니다.
+        if multiprocessing.current_process().daemon:
+            self.skipTest("run_parameter_sweep cannot start worker processes inside a daemonic test worker")
+        param_grid = [{'risk_per_trade': '0.02'}, {'risk_per_trade': '0.005'}, {'risk_per_trade': '0.01'}]
+
+        results = run_parameter_sweep(self.user, self.start, self.end, param_grid, initial_capital=10_000_000, max_workers=2)
+
+        self.assertEqual([params for params, _ in results], param_grid)
+        history_data = load_history_data(self.start, self.end)
+        for params, report in results:
+            expected = Backtester(
+                user=self.user, start_date=self.start, end_date=self.end, initial_capital=10_000_000,
+                strategy_params=params, history_data=history_data,
+            ).run()
+            self.assertEqual(report, {k: v for k, v in expected.items() if k not in ('trade_log', 'daily_values')})
+        # 파라미터마다 결과가 달라야 순서 검증이 의미가 있습니다.
+        self.assertEqual(len({report['final_value'] for _, report in results}), len(param_grid))
+
+
+@override_settings(TRADING_FEE_RATE=0.001, TRADING_TAX_RATE=0.0)
+class BacktestSettlementTest(TestCase):
+    def setUp(self):
+        self.day = date(2024, 1, 2)
+        history_data = pd.DataFrame({
+            'date': pd.to_datetime([self.day, self.day]),
+            'symbol': ['005930', '000660'],
+            'close_price': [1000.0, 2000.0],
+        }).set_index(['date', 'symbol'])
+        self.backtester = Backtester(
+            user=None, start_date=self.day, end_date=self.day, initial_capital=100_000, history_data=history_data,
+        )
+        self.backtester.current_date = self.day
+
+    def test_sell_fills_immediately(self):
+        """
+        Tests that a sell is reflected in the holdings and cash right away,
+        before the end-of-day settlement, so later steps of the day see it.
+        """
+        self.backtester.portfolio['005930'] = {'quantity': 10, 'buy_price': 900.0}
+
+        self.backtester.queue_order('005930', 10, 1000.0, 'SELL')
+
+        self.assertNotIn('005930', self.backtester.portfolio)
+        self.assertAlmostEqual(self.backtester.cash, 100_000 + 10_000 * (1 - 0.001))
+
+    def test_buys_of_a_symbol_settle_as_one_trade(self):
+        """
+        Tests that the day's buys of a symbol fill at end of day as a single
+        trade at the quantity-weighted average price, with one fee.
+        """
+        self.backtester.queue_order('005930', 10, 1000.0, 'BUY')
+        self.backtester.queue_order('005930', 30, 1200.0, 'BUY')
+        self.assertEqual(self.backtester.portfolio, {})
+
+        self.backtester._settle_day()
+
+        self.assertEqual(self.backtester.portfolio['005930'], {'quantity': 40, 'buy_price': 1150.0})
+        self.assertEqual(len(self.backtester.trade_log), 1)
+        self.assertAlmostEqual(self.backtester.cash, 100_000 - 46_000 * 1.001)
+
+    def test_buys_fill_in_order_when_cash_is_short(self):
+        """
+        Tests that when the combined buy is unaffordable, the orders are filled
+        one by one in submission order, as when each order filled immediately.
+        """
+        self.backtester.queue_order('005930', 60, 1000.0, 'BUY')
+        self.backtester.queue_order('005930', 50, 1000.0, 'BUY')
+
+        self.backtester._settle_day()
+
+        self.assertEqual(self.backtester.portfolio['005930']['quantity'], 60)
+        self.assertAlmostEqual(self.backtester.cash, 100_000 - 60_000 * 1.001)
+
+    def test_sell_after_buy_of_same_symbol(self):
+        """
+        Tests that selling shares bought earlier the same day fills the pending
+        buy first, so the sell succeeds.
+        """
+        self.backtester.queue_order('000660', 5, 2000.0, 'BUY')
+        self.backtester.queue_order('000660', 5, 2100.0, 'SELL')
+        self.backtester._settle_day()
+
+        self.assertNotIn('000660', self.backtester.portfolio)
+        self.assertEqual([t.type for t in self.backtester.trade_log], ['BUY', 'SELL'])
+        self.assertAlmostEqual(self.backtester.cash, 100_000 - 10_000 * 1.001 + 10_500 * (1 - 0.001))
@@ -1,12 +1,50 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from datetime import datetime
-from decimal import Decimal
-import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.io as pio
 
+from trading.models import StrategySettings
 from .backtest import Backtester
+from .historical_cache import cache_version
+
+# 같은 조건의 백테스트 결과(리포트와 그래프 HTML)를 재사용하는 시간 (초)
+BACKTEST_RESULT_CACHE_TIMEOUT = 60 * 60
+# 그래프 JSON은 orjson(requirements.txt)으로 직렬화합니다.
+# 기본값 'auto'와 달리 orjson이 없으면 표준 json으로 조용히 되돌아가지 않고 오류가 납니다.
+pio.json.config.default_engine = 'orjson'
+
+
+def _backtest_cache_key(user, start_date, end_date, initial_capital):
+    """
+    백테스트 결과 캐시 키. 시세 데이터나 전략 설정이 바뀌면 키도 바뀌어 다시 계산됩니다.
+    """
+    settings_updated_at = StrategySettings.objects.values_list('updated_at', flat=True).first()
+    return (f"bt:{user.id}:{start_date}:{end_date}:{initial_capital}:"
+            f"{settings_updated_at}:{cache_version()}").replace(' ', '_')
+
+
+def _build_plot_div(daily_values):
+    """
+    포트폴리오 가치 변화 그래프를 HTML div로 변환합니다.
+    DataFrame을 거치지 않고 날짜/가치 배열을 바로 만들어 WebGL(Scattergl) 트레이스로 그립니다.
+    날짜는 ISO 문자열 대신 epoch 밀리초 숫자 배열로 넘겨 Plotly가 base64 이진 배열로 직렬화하도록 합니다.
+    나머지 그래프 JSON은 orjson 엔진으로 직렬화됩니다.
+    """
+    dates = np.array([d['date'] for d in daily_values], dtype='datetime64[D]').astype('datetime64[ms]').astype(np.float64)
+    values = np.fromiter((float(d['value']) for d in daily_values), dtype=np.float64, count=len(daily_values))
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=dates, y=values, mode='lines', name='Portfolio Value'))
+    fig.update_layout(
+        title='Portfolio Value Over Time',
+        xaxis_title='Date',
+        xaxis_type='date',
+        yaxis_title='Portfolio Value (KRW)'
+    )
+    return pio.to_html(fig, full_html=False, include_plotlyjs='cdn')
+
 
 @login_required
 def backtest_view(request):
@@ -15,37 +53,34 @@ def backtest_view(request):
         try:
             start_date = datetime.strptime(request.POST.get('start_date'), '%Y-%m-%d').date()
             end_date = datetime.strptime(request.POST.get('end_date'), '%Y-%m-%d').date()
-            initial_capital = Decimal(request.POST.get('initial_capital', '100000000'))
-
-            # TODO: 폼에서 더 많은 전략 파라미터를 받을 수 있도록 확장 가능
-            strategy_params = {}
-
-            backtester = Backtester(
-                user=request.user,
-                start_date=start_date,
-                end_date=end_date,
-                initial_capital=initial_capital,
-                strategy_params=strategy_params
-            )
-            report = backtester.run()
-
-            if report and "error" not in report:
-                # Plotly 그래프 생성
-                daily_values = report['daily_values']
-                if daily_values:
-                    df = pd.DataFrame(daily_values)
-                    fig = go.Figure()
-                    fig.add_trace(go.Scatter(x=df['date'], y=df['value'], mode='lines', name='Portfolio Value'))
-                    fig.update_layout(
-                        title='Portfolio Value Over Time',
-                        xaxis_title='Date',
-                        yaxis_title='Portfolio Value (KRW)'
-                    )
-                    # 그래프를 HTML div로 변환
-                    plot_div = pio.to_html(fig, full_html=False, include_plotlyjs='cdn')
-                    context['plot_div'] = plot_div
-
-                context['report'] = report
+            initial_capital = float(request.POST.get('initial_capital', '100000000'))
+
+            # 같은 조건으로 다시 요청하면 백테스트와 그래프 직렬화를 건너뜁니다.
+            result = cache.get(_backtest_cache_key(request.user, start_date, end_date, initial_capital))
+            if result is None:
+                # TODO: 폼에서 더 많은 전략 파라미터를 받을 수 있도록 확장 가능
+                strategy_params = {}
+
+                backtester = Backtester(
+                    user=request.user,
+                    start_date=start_date,
+                    end_date=end_date,
+                    initial_capital=initial_capital,
+                    strategy_params=strategy_params
+                )
+                report = backtester.run()
+
+                if report and "error" not in report:
+                    result = {'report': report}
+                    # Plotly 그래프 생성
+                    if report['daily_values']:
+                        result['plot_div'] = _build_plot_div(report['daily_values'])
+                    # 실행 중 Parquet 캐시가 새로 만들어졌을 수 있으므로 키는 실행 후에 계산
+                    cache.set(_backtest_cache_key(request.user, start_date, end_date, initial_capital),
+                              result, BACKTEST_RESULT_CACHE_TIMEOUT)
+
+            if result:
+                context.update(result)
 
         except Exception as e:
             context['error'] = f"An error occurred: {e}"
@@ -27,6 +27,7 @@ class PortfolioAdmin(admin.ModelAdmin):
     """
     list_display = ('account', 'symbol', 'stock_name', 'quantity', 'formatted_average_buy_price', 'is_open', 'updated_at')
     list_filter = ('is_open', 'account')
+    list_select_related = ('account__user',)
     search_fields = ('symbol', 'stock_name')
     ordering = ('-updated_at',)
 
@@ -57,6 +58,7 @@ class TradingAccountAdmin(admin.ModelAdmin):
     """
     list_display = ('user', 'account_name', 'account_number', 'brokerage', 'account_type', 'is_active')
     list_filter = ('brokerage', 'account_type', 'is_active')
+    list_select_related = ('user',)
     search_fields = ('user__username', 'account_name', 'account_number')
 
 @admin.register(TradeLog)
@@ -66,6 +68,7 @@ class TradeLogAdmin(admin.ModelAdmin):
     """
     list_display = ('timestamp', 'account', 'symbol', 'trade_type', 'status', 'quantity', 'formatted_price')
     list_filter = ('status', 'trade_type', 'account')
+    list_select_related = ('account__user',)
     search_fields = ('symbol', 'order_id')
     ordering = ('-timestamp',)
 
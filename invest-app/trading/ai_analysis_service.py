@@ -1,15 +1,42 @@
 import logging
+import math
+import threading
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
 from prophet import Prophet
 from dataclasses import dataclass
 from typing import Dict, Any
+from django.core.cache import cache
+from django.utils import timezone
 
 from .kis_client import KISApiClient
 from .models import TradingAccount
 
 logger = logging.getLogger(__name__)
 
+# Prophet forecasts only change when a new daily bar arrives, so they are
+# cached per (symbol, last bar date) for a day.
+PROPHET_FORECAST_CACHE_TIMEOUT = 60 * 60 * 24
+# KIS daily chart fields kept in the analysis price frame, and their column names.
+PRICE_FRAME_COLUMNS = {
+    'stck_clpr': 'close',
+    'stck_oprc': 'open',
+    'stck_hgpr': 'high',
+    'stck_lwpr': 'low',
+    'acml_vol': 'volume',
+    'acml_tr_pbmn': 'acml_tr_pbmn',
+}
+# Parsed daily price histories are reused for an hour so that the latest bar
+# is refreshed during market hours.
+PRICE_FRAME_CACHE_TIMEOUT = 60 * 60
+# The market trend is shared by every analysis of the day; refresh it every 30 minutes.
+MARKET_TREND_CACHE_TIMEOUT = 60 * 30
+# KIS clients reused by get_detailed_strategy: {credentials: KISApiClient}
+_client_cache = {}
+_client_cache_lock = threading.Lock()
+# Keys for the values returned by numba_kernels.latest_indicators, in order.
+INDICATOR_KEYS = ('rsi_14', 'macd_line', 'macd_signal', 'macd_hist', 'bb_upper', 'bb_lower', 'latest_atr', 'sma_50')
+
 @dataclass
 class StockAnalysisResult:
     """
@@ -29,8 +56,6 @@ class StockAnalysisResult:
     target_price: float
     raw_data: Dict[str, Any]
 
-from decimal import Decimal
-
 @dataclass
 class DetailedStrategyResult:
     """
@@ -47,6 +72,26 @@ class DetailedStrategyResult:
     stop_loss_price: float
     raw_data: Dict[str, Any]
 
+def _client_for(account: TradingAccount) -> KISApiClient:
+    """
+    Returns a KISApiClient for the account, reusing one per set of credentials.
+
+    Reusing the client keeps its pooled session (and so its TCP/TLS
+    connections) alive across detailed-strategy requests. Keying on the
+    credentials means an edited account gets a fresh client.
+    """
+    key = (account.app_key, account.app_secret, account.account_number, account.account_type)
+    with _client_cache_lock:
+        client = _client_cache.get(key)
+        if client is None:
+            client = _client_cache[key] = KISApiClient(
+                app_key=account.app_key,
+                app_secret=account.app_secret,
+                account_no=account.account_number,
+                account_type=account.account_type
+            )
+    return client
+
 def get_detailed_strategy(user, symbol: str, horizon: str) -> DetailedStrategyResult:
     """
     Generates a detailed trading strategy for a stock and investment horizon.
@@ -71,52 +116,20 @@ def get_detailed_strategy(user, symbol: str, horizon: str) -> DetailedStrategyRe
         if not account:
             raise ValueError("User does not have an active trading account.")
 
-        client = KISApiClient(
-            app_key=account.app_key,
-            app_secret=account.app_secret,
-            account_no=account.account_number,
-            account_type=account.account_type
-        )
+        client = _client_for(account)
     except Exception as e:
         logger.error(f"Failed to initialize client for user {user}: {e}", exc_info=True)
         return None
 
     # 2. Fetch and prepare data
-    try:
-        history_response = client.get_daily_price_history(symbol, days=730)
-        if not history_response or not history_response.is_ok():
-            logger.error(f"Failed to fetch historical data for {symbol}: {history_response.get_error_message()}")
-            return None
-
-        price_history = history_response.get_body().get('output2')
-        if not price_history:
-            logger.warning(f"No historical data in response for {symbol}.")
-            return None
-
-        df = pd.DataFrame(price_history)
-        df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'], format='%Y%m%d')
-        numeric_cols = ['stck_clpr', 'stck_oprc', 'stck_hgpr', 'stck_lwpr', 'acml_vol', 'acml_tr_pbmn']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        df = df.set_index('stck_bsop_date').sort_index()
-        df.rename(columns={'stck_oprc': 'open', 'stck_hgpr': 'high', 'stck_lwpr': 'low', 'stck_clpr': 'close', 'acml_vol': 'volume'}, inplace=True)
-        df.dropna(inplace=True)
-
-    except Exception as e:
-        logger.error(f"Error processing data for {symbol}: {e}", exc_info=True)
-        return None
-
-    if df.empty:
-        logger.warning(f"No historical data available for {symbol} after processing.")
+    df = _fetch_price_frame(symbol, client)
+    if df is None:
         return None
 
     # 3. Technical Analysis
     try:
-        df.ta.atr(length=14, append=True)
-        latest_indicators = df.iloc[-1]
-        latest_close = latest_indicators['close']
-        latest_atr = latest_indicators.get('ATRr_14')
+        latest_close = float(df['close'].iloc[-1])
+        latest_atr = _compute_indicators(df)['latest_atr']
         if not latest_atr or latest_atr == 0:
             latest_atr = latest_close * 0.05 # Fallback ATR
     except Exception as e:
@@ -140,13 +153,13 @@ def get_detailed_strategy(user, symbol: str, horizon: str) -> DetailedStrategyRe
         if balance_res and balance_res.is_ok():
             body = balance_res.get_body()
             summary = body.get('output2', [{}])[0]
-            cash_available = Decimal(summary.get('dnca_tot_amt', '0'))
-
-            # Allocate 20% of available cash for this position
-            position_budget = cash_available * Decimal('0.20')
+            # KRW amounts and prices are whole won, so size the position with integer math.
+            cash_available = int(float(summary.get('dnca_tot_amt', '0')))
+            price = int(latest_close)
 
-            if latest_close > 0:
-                buy_quantity = int(position_budget // Decimal(latest_close))
+            # Allocate 20% (1/5) of available cash for this position
+            if price > 0:
+                buy_quantity = cash_available // (5 * price)
         else:
             logger.warning(f"Could not retrieve account balance for user {user}. Buy quantity set to 0.")
 
@@ -185,6 +198,32 @@ def analyze_stock(symbol: str, client: KISApiClient, market_trend: str = None) -
     """
     logger.info(f"AI Service: Starting analysis for symbol {symbol}...")
 
+    df = _fetch_price_frame(symbol, client)
+    if df is None:
+        return None
+
+    if not market_trend:
+        market_trend = get_market_trend(client)
+
+    return _analyze_price_frame(symbol, df, market_trend)
+
+
+def _fetch_price_frame(symbol: str, client: KISApiClient):
+    """
+    Fetches two years of daily prices for a stock as a date-indexed DataFrame
+    with numeric open/high/low/close/volume columns.
+
+    The parsed frame is cached per symbol and KST date, so analyze_stock and
+    get_detailed_strategy share a single API call.
+
+    Returns:
+        pd.DataFrame | None: The price history, or None if it is unavailable.
+    """
+    key = f"ai:history:{symbol}:{timezone.localdate()}"
+    df = cache.get(key)
+    if df is not None:
+        return df
+
     # 1. Fetch and prepare data
     try:
         history_response = client.get_daily_price_history(symbol, days=730)
@@ -197,15 +236,15 @@ def analyze_stock(symbol: str, client: KISApiClient, market_trend: str = None) -
             logger.warning(f"No historical data in response for {symbol}.")
             return None
 
-        df = pd.DataFrame(price_history)
-        df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'], format='%Y%m%d')
-        numeric_cols = ['stck_clpr', 'stck_oprc', 'stck_hgpr', 'stck_lwpr', 'acml_vol', 'acml_tr_pbmn']
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        df = df.set_index('stck_bsop_date').sort_index()
-        df.rename(columns={'stck_oprc': 'open', 'stck_hgpr': 'high', 'stck_lwpr': 'low', 'stck_clpr': 'close', 'acml_vol': 'volume'}, inplace=True)
-        df.dropna(inplace=True)
+        # Build only the used columns straight from the response records instead of
+        # a DataFrame of every KIS field that is then converted and renamed.
+        dates = pd.to_datetime([row.get('stck_bsop_date') for row in price_history], format='%Y%m%d')
+        df = pd.DataFrame(
+            {name: pd.to_numeric([row.get(field) for row in price_history], errors='coerce')
+             for field, name in PRICE_FRAME_COLUMNS.items()},
+            index=pd.DatetimeIndex(dates, name='stck_bsop_date'),
+        )
+        df = df.sort_index().dropna()
 
     except Exception as e:
         logger.error(f"Error processing data for {symbol}: {e}", exc_info=True)
@@ -215,34 +254,27 @@ def analyze_stock(symbol: str, client: KISApiClient, market_trend: str = None) -
         logger.warning(f"No historical data available for {symbol} after processing.")
         return None
 
-    # 2. Technical Analysis with pandas_ta
+    cache.set(key, df, PRICE_FRAME_CACHE_TIMEOUT)
+    return df
+
+
+def _analyze_price_frame(symbol: str, df: pd.DataFrame, market_trend: str) -> StockAnalysisResult:
+    """
+    Runs the indicator, risk, forecast and horizon steps of analyze_stock on
+    an already fetched price history.
+    """
+    # 2. Technical Analysis (RSI, MACD, Bollinger Bands, ATR in one Numba pass)
     try:
-        df.ta.rsi(length=14, append=True)
-        df.ta.macd(fast=12, slow=26, signal=9, append=True)
-        df.ta.bbands(length=20, std=2, append=True)
-        df.ta.atr(length=14, append=True)
-
-        latest_indicators = df.iloc[-1]
-        latest_close = latest_indicators['close']
-
-        raw_data = {
-            'latest_close': latest_close,
-            'rsi_14': latest_indicators.get('RSI_14'),
-            'macd_line': latest_indicators.get('MACD_12_26_9'),
-            'macd_signal': latest_indicators.get('MACDs_12_26_9'),
-            'macd_hist': latest_indicators.get('MACDh_12_26_9'),
-            'bb_upper': latest_indicators.get('BBU_20_2.0'),
-            'bb_lower': latest_indicators.get('BBL_20_2.0'),
-            'latest_atr': latest_indicators.get('ATRr_14')
-        }
+        latest_close = float(df['close'].iloc[-1])
+        indicators = _compute_indicators(df)
+        sma_50 = indicators.pop('sma_50')
+
+        raw_data = {'latest_close': latest_close, **indicators}
     except Exception as e:
         logger.error(f"Failed to calculate technical indicators for {symbol}: {e}", exc_info=True)
         return None
 
     # 3. Risk Levels based on ATR and Market Trend
-    if not market_trend:
-        market_trend = get_market_trend(client)
-
     if market_trend == 'BULL':
         atr_multiplier = 2.5
     elif market_trend == 'BEAR':
@@ -257,13 +289,8 @@ def analyze_stock(symbol: str, client: KISApiClient, market_trend: str = None) -
 
     # 4. Prophet Forecasting
     try:
-        prophet_df = df.reset_index()[['stck_bsop_date', 'close']].rename(columns={'stck_bsop_date': 'ds', 'close': 'y'})
-        model = Prophet(daily_seasonality=True)
-        model.fit(prophet_df)
-        future = model.make_future_dataframe(periods=90)
-        forecast = model.predict(future)
-        forecast_30d = forecast['yhat'].iloc[-60]
-        forecast_90d = forecast['yhat'].iloc[-1]
+        prophet_df = pd.DataFrame({'ds': df.index.to_numpy(), 'y': df['close'].to_numpy()})
+        forecast_30d, forecast_90d = _get_prophet_forecast(symbol, prophet_df)
         raw_data.update({
             'forecast_30d_yhat': forecast_30d,
             'forecast_90d_yhat': forecast_90d
@@ -280,7 +307,7 @@ def analyze_stock(symbol: str, client: KISApiClient, market_trend: str = None) -
         is_buy_signal = (
             raw_data['rsi_14'] < 70 and
             raw_data['macd_line'] > raw_data['macd_signal'] and
-            latest_close > df['close'].rolling(window=50).mean().iloc[-1]
+            sma_50 is not None and latest_close > sma_50
         )
 
         if is_buy_signal:
@@ -308,12 +335,64 @@ def analyze_stock(symbol: str, client: KISApiClient, market_trend: str = None) -
         raw_data=raw_data
     )
 
+def _compute_indicators(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Returns the latest technical indicator values for a price history.
+
+    Only the last value of each indicator is used, so they are computed by a
+    single Numba kernel over the close/high/low arrays instead of building
+    full indicator columns. Indicators without enough history are None.
+
+    Args:
+        df (pd.DataFrame): Price history with 'close', 'high' and 'low' columns.
+
+    Returns:
+        Dict[str, Any]: Values keyed by INDICATOR_KEYS.
+    """
+    from .numba_kernels import latest_indicators
+    values = latest_indicators(*(df[col].to_numpy(dtype=np.float64) for col in ('close', 'high', 'low')))
+    return {key: None if math.isnan(value) else value for key, value in zip(INDICATOR_KEYS, values)}
+
+def _get_prophet_forecast(symbol: str, prophet_df: pd.DataFrame) -> tuple:
+    """
+    Returns the Prophet (30-day, 90-day) yhat forecasts for a stock.
+
+    Fitting Prophet is by far the slowest step of the analysis, and the result
+    depends only on the history up to the last trading date. The two forecast
+    values are therefore cached per symbol and last bar date, so repeated
+    analyses on the same day skip both the fit and the prediction.
+
+    Args:
+        symbol (str): The stock symbol.
+        prophet_df (pd.DataFrame): The price history with 'ds' and 'y' columns.
+
+    Returns:
+        tuple: (forecast_30d, forecast_90d) as floats.
+    """
+    last_date = prophet_df['ds'].iloc[-1]
+    key = f"prophet:{symbol}:{last_date.date()}"
+    forecast = cache.get(key)
+    if forecast is not None:
+        return forecast
+
+    # Only the point forecasts are used, so skip the uncertainty sampling and
+    # predict just the two target dates (the 31st and 90th day after the last bar).
+    model = Prophet(daily_seasonality=True, uncertainty_samples=0)
+    model.fit(prophet_df)
+    future = pd.DataFrame({'ds': [last_date + pd.Timedelta(days=31), last_date + pd.Timedelta(days=90)]})
+    yhat = model.predict(future)['yhat']
+    forecast = (float(yhat.iloc[0]), float(yhat.iloc[1]))
+    cache.set(key, forecast, PROPHET_FORECAST_CACHE_TIMEOUT)
+    return forecast
+
 def get_market_trend(client: KISApiClient) -> str:
     """
     Analyzes the overall market trend using a major index proxy (Samsung Electronics).
 
     It calculates 20, 60, and 120-day simple moving averages (SMAs) to
     determine if the market is in a bullish, bearish, or sideways trend.
+    The trend is cached per KST date for MARKET_TREND_CACHE_TIMEOUT, so
+    per-symbol analyses and the dashboard do not refetch the proxy history.
 
     Args:
         client (KISApiClient): An initialized KIS API client.
@@ -321,30 +400,45 @@ def get_market_trend(client: KISApiClient) -> str:
     Returns:
         str: 'BULL', 'BEAR', or 'SIDEWAYS'. Defaults to 'SIDEWAYS' on error.
     """
+    key = f"market_trend:{timezone.localdate()}"
+    trend = cache.get(key)
+    if trend is None:
+        trend = _compute_market_trend(client)
+        if trend is None:
+            return 'SIDEWAYS'
+        cache.set(key, trend, MARKET_TREND_CACHE_TIMEOUT)
+    return trend
+
+def _compute_market_trend(client: KISApiClient):
+    """
+    Computes the market trend from the latest 20/60/120-day SMAs of the proxy.
+
+    Returns:
+        str | None: 'BULL', 'BEAR', or 'SIDEWAYS', or None if the data could
+                    not be fetched or parsed (so the failure is not cached).
+    """
     logger.info("Analyzing overall market trend...")
     try:
         # Using Samsung Electronics ('005930') as a proxy for the KOSPI index
         history_response = client.get_daily_price_history("005930", days=250)
         if not history_response or not history_response.is_ok():
             logger.error("Failed to fetch market index data for trend analysis.")
-            return 'SIDEWAYS'
+            return None
 
         price_history = history_response.get_body().get('output2')
-        df = pd.DataFrame(price_history)
-        df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'], format='%Y%m%d')
-        df['stck_clpr'] = pd.to_numeric(df['stck_clpr'])
-        df = df.set_index('stck_bsop_date').sort_index()
-
-        df['sma_20'] = df['stck_clpr'].rolling(window=20).mean()
-        df['sma_60'] = df['stck_clpr'].rolling(window=60).mean()
-        df['sma_120'] = df['stck_clpr'].rolling(window=120).mean()
+        dates = np.array([d['stck_bsop_date'] for d in price_history])
+        closes = np.asarray([d['stck_clpr'] for d in price_history], dtype=np.float64)[np.argsort(dates, kind='stable')]
 
-        latest = df.iloc[-1]
+        # Only the latest SMA values are compared, so take trailing means.
+        if len(closes) < 120:
+            logger.info("Market Trend: SIDEWAYS (not enough history for the 120-day SMA)")
+            return 'SIDEWAYS'
+        sma_20, sma_60, sma_120 = (closes[-window:].mean() for window in (20, 60, 120))
 
-        if latest['sma_20'] > latest['sma_60'] and latest['sma_60'] > latest['sma_120']:
+        if sma_20 > sma_60 and sma_60 > sma_120:
             logger.info("Market Trend: BULL")
             return 'BULL'
-        elif latest['sma_20'] < latest['sma_60'] and latest['sma_60'] < latest['sma_120']:
+        elif sma_20 < sma_60 and sma_60 < sma_120:
             logger.info("Market Trend: BEAR")
             return 'BEAR'
         else:
@@ -353,7 +447,7 @@ def get_market_trend(client: KISApiClient) -> str:
 
     except Exception as e:
         logger.error(f"Error during market trend analysis: {e}", exc_info=True)
-        return 'SIDEWAYS'
+        return None
 
 def recommend_strategy_allocations(market_trend: str) -> Dict[str, int]:
     """
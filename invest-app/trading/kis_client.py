@@ -1,13 +1,15 @@
 # invest-app/trading/kis_client.py
 # ... 상단 코드는 이전과 동일 ...
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime, timedelta, time
 import time
 import os
+from django.conf import settings
 from django.core.cache import cache
-import pytz
 import logging
+import threading
 import websockets
 from collections import namedtuple
 from base64 import b64decode
@@ -100,6 +102,25 @@ class KISAPIResponse:
         return self._response.text
 
 
+class RateLimiter:
+    """
+    Spaces out calls shared by several threads so that at most
+    `calls_per_second` requests start per second.
+    """
+    def __init__(self, calls_per_second):
+        self.interval = 1.0 / calls_per_second
+        self._lock = threading.Lock()
+        self._next_call = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_call - now
+            self._next_call = max(now, self._next_call) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
 class KISApiClient:
     """
     A client for interacting with the KIS (Korea Investment & Securities) API.
@@ -116,8 +137,16 @@ class KISApiClient:
                             simulation account.
         base_url (str): The base URL for the KIS API, determined by account_type.
         cache_key (str): The key used for caching the access token.
+        session (requests.Session): A pooled HTTP session reused for every call,
+                                    so TCP/TLS connections are kept alive.
+        rate_limiter (RateLimiter | None): Optional limiter applied before each API call.
     """
-    def __init__(self, app_key, app_secret, account_no, account_type='SIM'):
+    # Connection pool size; matches the largest thread pool that shares one client.
+    POOL_SIZE = 20
+    # Parsed .mst files shared by all clients in the process: {path: (mtime, stocks)}
+    _mst_cache = {}
+
+    def __init__(self, app_key, app_secret, account_no, account_type='SIM', rate_limiter=None):
         """
         Initializes the KISApiClient.
 
@@ -127,6 +156,7 @@ class KISApiClient:
             account_no (str): The trading account number.
             account_type (str, optional): The type of account ('REAL' or 'SIM').
                                           Defaults to 'SIM'.
+            rate_limiter (RateLimiter, optional): Shared limiter for concurrent callers.
         """
         logger.info(f"KISApiClient instantiated for account {account_no} (type: {account_type})")
         self.app_key = app_key
@@ -138,6 +168,14 @@ class KISApiClient:
         else:
             self.base_url = "https://openapivts.koreainvestment.com:29443"
         self.cache_key = f"kis_token_{self.app_key}"
+        self.rate_limiter = rate_limiter
+        self._token_lock = threading.Lock()
+
+        # Pooled keep-alive connections shared by all requests of this client.
+        # Retries are handled by _send_request only, not by the adapter.
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
 
     def _issue_token(self):
         """
@@ -154,7 +192,7 @@ class KISApiClient:
         headers = {"content-type": "application/json"}
         body = {"grant_type": "client_credentials", "appkey": self.app_key, "appsecret": self.app_secret}
         try:
-            response = requests.post(url, headers=headers, data=json.dumps(body))
+            response = self.session.post(url, headers=headers, data=json.dumps(body))
             response.raise_for_status()
             try:
                 result = response.json()
@@ -184,8 +222,13 @@ class KISApiClient:
         cached_token = cache.get(self.cache_key)
         if cached_token:
             return cached_token
-        logger.info("Token not in cache or expired, issuing a new one.")
-        return self._issue_token()
+        # Concurrent callers sharing this client must not each issue a token.
+        with self._token_lock:
+            cached_token = cache.get(self.cache_key)
+            if cached_token:
+                return cached_token
+            logger.info("Token not in cache or expired, issuing a new one.")
+            return self._issue_token()
 
     def _send_request(self, method, path, params=None, body=None, tr_id=None, retries=3, delay=5):
         """
@@ -219,10 +262,12 @@ class KISApiClient:
 
         for i in range(retries):
             try:
+                if self.rate_limiter:
+                    self.rate_limiter.wait()
                 if method.upper() == 'GET':
-                    response = requests.get(url, headers=headers, params=params)
+                    response = self.session.get(url, headers=headers, params=params)
                 else:
-                    response = requests.post(url, headers=headers, data=json.dumps(body))
+                    response = self.session.post(url, headers=headers, data=json.dumps(body))
 
                 response.raise_for_status()
                 api_response = KISAPIResponse(response)
@@ -487,8 +532,7 @@ class KISApiClient:
 
         # Fallback for simulation environment during market hours
         if self.account_type == 'SIM':
-            tz = pytz.timezone('Asia/Seoul')
-            now = datetime.now(tz)
+            now = datetime.now(settings.KST)
             if 0 <= now.weekday() <= 4 and time(9, 0) <= now.time() <= time(15, 30):
                 logger.warning("Simulation Env: API reports market closed, but "
                                "continuing as if open due to time of day.")
@@ -547,12 +591,25 @@ class KISApiClient:
             file_name = f"{market_code}_code.mst"
             full_path = os.path.join(mst_file_path, file_name)
 
+            # The .mst files only change when the KIS application re-downloads them,
+            # so a parse is reused for as long as the file's mtime is unchanged.
+            try:
+                mtime = os.path.getmtime(full_path)
+            except OSError:
+                mtime = None
+            cached = self._mst_cache.get(full_path)
+            if mtime is not None and cached and cached[0] == mtime:
+                all_stocks.update(cached[1])
+                continue
+
             logger.info(f"Reading stock codes from {full_path}...")
             try:
                 with open(full_path, 'rb') as f:
                     file_content = f.read()
                     stocks = self._parse_mst_file(file_content)
                     all_stocks.update(stocks)
+                if mtime is not None:
+                    self._mst_cache[full_path] = (mtime, stocks)
             except FileNotFoundError:
                 logger.error(f"File not found: {full_path}. Ensure the KIS desktop "
                                f"application has downloaded the necessary files.")
@@ -617,7 +674,7 @@ class KISApiClient:
         headers = {"content-type": "application/json"}
         body = {"grant_type": "client_credentials", "appkey": self.app_key, "appsecret": self.app_secret}
 
-        response = requests.post(url, headers=headers, data=json.dumps(body))
+        response = self.session.post(url, headers=headers, data=json.dumps(body))
 
         if response.status_code == 200:
             return response.json().get('approval_key')
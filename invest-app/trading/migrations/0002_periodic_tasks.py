@@ -0,0 +1,51 @@
+from django.db import migrations
+
+
+# Schedules previously hard-coded in settings.CELERY_BEAT_SCHEDULE.
+# The DatabaseScheduler is now the single source of truth; edit them in the admin.
+PERIODIC_TASKS = [
+    {
+        'name': 'run-weekly-stock-screening',
+        'task': 'trading.tasks.run_stock_screening_task',
+        'crontab': {'minute': '50', 'hour': '8', 'day_of_week': 'mon'},
+    },
+    {
+        'name': 'run-daily-trading',
+        'task': 'trading.tasks.run_daily_trader_task',
+        'crontab': {'minute': '5', 'hour': '9', 'day_of_week': '1-5'},
+    },
+]
+
+
+def create_periodic_tasks(apps, schema_editor):
+    CrontabSchedule = apps.get_model('django_celery_beat', 'CrontabSchedule')
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+
+    for entry in PERIODIC_TASKS:
+        schedule, _ = CrontabSchedule.objects.get_or_create(
+            day_of_month='*',
+            month_of_year='*',
+            timezone='Asia/Seoul',
+            **entry['crontab'],
+        )
+        PeriodicTask.objects.update_or_create(
+            name=entry['name'],
+            defaults={'task': entry['task'], 'crontab': schedule, 'enabled': True},
+        )
+
+
+def delete_periodic_tasks(apps, schema_editor):
+    PeriodicTask = apps.get_model('django_celery_beat', 'PeriodicTask')
+    PeriodicTask.objects.filter(name__in=[entry['name'] for entry in PERIODIC_TASKS]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0001_initial'),
+        ('django_celery_beat', '0018_improve_crontab_helptext'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_periodic_tasks, delete_periodic_tasks),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-16 15:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0002_periodic_tasks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analyzedstock',
+            index=models.Index(fields=['investment_horizon'], name='analyzed_horizon_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analyzedstock',
+            index=models.Index(fields=['is_investable'], name='analyzed_investable_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tradelog',
+            index=models.Index(fields=['status'], name='tradelog_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tradelog',
+            index=models.Index(fields=['trade_type'], name='tradelog_trade_type_idx'),
+        ),
+    ]
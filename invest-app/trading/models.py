@@ -60,9 +60,31 @@ class TradeLog(models.Model):
     def total_amount(self):
         return self.quantity * self.price
 
+    class Meta:
+        # Match the admin changelist filters.
+        indexes = [
+            models.Index(fields=['status'], name='tradelog_status_idx'),
+            models.Index(fields=['trade_type'], name='tradelog_trade_type_idx'),
+        ]
+
     def __str__(self):
         return f"[{self.timestamp.strftime('%Y-%m-%d %H:%M')}] {self.account.account_name} - {self.symbol} {self.get_trade_type_display()} ({self.status})"
 
+class AnalyzedStockManager(models.Manager):
+    """
+    Default manager for AnalyzedStock that defers raw_analysis_data.
+
+    The JSON blob holds the full financials list for every stock and is only
+    needed when trading on a stock, so it is not fetched unless requested with
+    with_raw_data().
+    """
+    def get_queryset(self):
+        return super().get_queryset().defer('raw_analysis_data')
+
+    def with_raw_data(self):
+        """Returns a queryset that also loads raw_analysis_data."""
+        return super().get_queryset()
+
 class AnalyzedStock(models.Model):
     """
     Stores the results of the AI stock analysis.
@@ -88,6 +110,15 @@ class AnalyzedStock(models.Model):
     last_price = models.DecimalField(max_digits=15, decimal_places=2, default=0, help_text="The stock price at the time of analysis.")
     raw_analysis_data = models.JSONField(default=dict, blank=True, help_text="Raw data used in the analysis (e.g., financial ratios).")
 
+    objects = AnalyzedStockManager()
+
+    class Meta:
+        # Match the admin changelist filters.
+        indexes = [
+            models.Index(fields=['investment_horizon'], name='analyzed_horizon_idx'),
+            models.Index(fields=['is_investable'], name='analyzed_investable_idx'),
+        ]
+
     def __str__(self):
         return f"[{self.symbol}] {self.stock_name} ({self.get_investment_horizon_display()})"
 
@@ -0,0 +1,122 @@
+import math
+
+import numba
+import numpy as np
+
+# Numba kernels for the indicators used by ai_analysis_service.
+# Imported lazily by the service so that web processes only load numba (LLVM)
+# when an analysis actually runs; Celery workers import it after
+# invest.numba_patch has been applied and pre-compile it in warm_up_jit.
+
+RSI_LENGTH = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BBANDS_LENGTH, BBANDS_STD = 20, 2.0
+ATR_LENGTH = 14
+TREND_SMA_LENGTH = 50
+
+
+@numba.njit(cache=True, nogil=True)
+def latest_indicators(close, high, low):
+    """
+    Computes the latest RSI(14), MACD(12, 26, 9), Bollinger Bands(20, 2),
+    ATR(14) and 50-day SMA values in a single pass over the price arrays.
+
+    The values follow pandas_ta's pure-pandas implementations: RSI and ATR
+    use Wilder's RMA (ATR seeded with the SMA of the first 14 true ranges),
+    the MACD EMAs are seeded with an SMA, and the bands use the sample
+    standard deviation. An indicator without enough history is NaN.
+
+    Returns:
+        tuple: (rsi, macd, macd_signal, macd_hist, bb_upper, bb_lower, atr, sma_50)
+    """
+    n = close.shape[0]
+    nan = np.nan
+    rsi = macd = macd_signal = macd_hist = bb_upper = bb_lower = atr = sma_50 = nan
+
+    rma_alpha = 1.0 / RSI_LENGTH
+    fast_alpha = 2.0 / (MACD_FAST + 1)
+    slow_alpha = 2.0 / (MACD_SLOW + 1)
+    signal_alpha = 2.0 / (MACD_SIGNAL + 1)
+    macd_start = MACD_SLOW - 1
+
+    avg_gain = avg_loss = 0.0
+    fast_ema = slow_ema = signal_ema = 0.0
+    fast_sum = slow_sum = signal_sum = tr_sum = 0.0
+    for i in range(n):
+        c = close[i]
+
+        # RSI: RMA of gains and losses, starting from the first difference
+        if i >= 1:
+            diff = c - close[i - 1]
+            gain = diff if diff > 0.0 else 0.0
+            loss = -diff if diff < 0.0 else 0.0
+            if i == 1:
+                avg_gain, avg_loss = gain, loss
+            else:
+                avg_gain += rma_alpha * (gain - avg_gain)
+                avg_loss += rma_alpha * (loss - avg_loss)
+
+        # MACD: SMA-seeded EMAs, and the signal EMA seeded from the first MACD values
+        if i < MACD_FAST:
+            fast_sum += c
+            if i == MACD_FAST - 1:
+                fast_ema = fast_sum / MACD_FAST
+        else:
+            fast_ema += fast_alpha * (c - fast_ema)
+        if i < MACD_SLOW:
+            slow_sum += c
+            if i == MACD_SLOW - 1:
+                slow_ema = slow_sum / MACD_SLOW
+        else:
+            slow_ema += slow_alpha * (c - slow_ema)
+        if i >= macd_start:
+            macd = fast_ema - slow_ema
+            if i < macd_start + MACD_SIGNAL:
+                signal_sum += macd
+                if i == macd_start + MACD_SIGNAL - 1:
+                    signal_ema = signal_sum / MACD_SIGNAL
+            else:
+                signal_ema += signal_alpha * (macd - signal_ema)
+
+        # ATR: RMA of the true range, seeded with the SMA of the first ATR_LENGTH values
+        if i == 0:
+            tr = abs(high[0] - low[0])
+        else:
+            prev_close = close[i - 1]
+            tr = max(abs(high[i] - low[i]), abs(high[i] - prev_close), abs(prev_close - low[i]))
+        if i < ATR_LENGTH:
+            tr_sum += tr
+            if i == ATR_LENGTH - 1:
+                atr = tr_sum / ATR_LENGTH
+        else:
+            atr += rma_alpha * (tr - atr)
+
+    if n > RSI_LENGTH:
+        rsi = 100.0 * avg_gain / (avg_gain + avg_loss)
+    if n >= macd_start + MACD_SIGNAL:
+        macd_signal = signal_ema
+        macd_hist = macd - signal_ema
+    else:
+        macd = nan
+    if n <= ATR_LENGTH:
+        atr = nan
+
+    if n >= BBANDS_LENGTH:
+        mean = 0.0
+        for i in range(n - BBANDS_LENGTH, n):
+            mean += close[i]
+        mean /= BBANDS_LENGTH
+        sq_sum = 0.0
+        for i in range(n - BBANDS_LENGTH, n):
+            sq_sum += (close[i] - mean) ** 2
+        std = math.sqrt(sq_sum / (BBANDS_LENGTH - 1))
+        bb_upper = mean + BBANDS_STD * std
+        bb_lower = mean - BBANDS_STD * std
+
+    if n >= TREND_SMA_LENGTH:
+        total = 0.0
+        for i in range(n - TREND_SMA_LENGTH, n):
+            total += close[i]
+        sma_50 = total / TREND_SMA_LENGTH
+
+    return rsi, macd, macd_signal, macd_hist, bb_upper, bb_lower, atr, sma_50
@@ -90,7 +90,7 @@ def update_portfolio_on_execution(sender, instance, created, **kwargs):
     try:
         with transaction.atomic():
             if instance.trade_type == 'BUY':
-                analyzed_stock = AnalyzedStock.objects.filter(symbol=instance.symbol).first()
+                analyzed_stock = AnalyzedStock.objects.with_raw_data().filter(symbol=instance.symbol).first()
                 stop_loss = analyzed_stock.raw_analysis_data.get('stop_loss_price', instance.price * Decimal('0.9'))
                 target_price = analyzed_stock.raw_analysis_data.get('target_price', instance.price * Decimal('1.2'))
 
@@ -0,0 +1,51 @@
+import math
+
+import numpy as np
+from django.test import TestCase
+
+from trading.numba_kernels import latest_indicators
+
+
+def make_prices(n):
+    """Deterministic close/high/low series with a trend, a cycle and uneven ranges."""
+    i = np.arange(n, dtype=np.float64)
+    close = 10000 + 300 * np.sin(i / 5) + 20 * i
+    high = close + 50 + 10 * (i % 3)
+    low = close - 40 - 10 * (i % 4)
+    return close, high, low
+
+
+class LatestIndicatorsTest(TestCase):
+    # Reference values from pandas-ta 0.4.71b0 (RSI_14, MACD_12_26_9, MACDs_12_26_9,
+    # MACDh_12_26_9, BBU_20_2.0_2.0, BBL_20_2.0_2.0, ATRr_14) and close.rolling(50).mean().
+    EXPECTED_80 = (
+        64.61866006819122, 168.71572517716413, 196.41352891365577, -27.697803736491636,
+        11959.602576734529, 11085.993037307331, 119.99700207293765, 11147.368445510707,
+    )
+    EXPECTED_30 = (
+        78.26592605496188, None, None, None,
+        10520.889092638428, 10071.182650528654, 119.24304194969815, None,
+    )
+
+    def assert_indicators(self, actual, expected):
+        names = ('rsi', 'macd', 'macd_signal', 'macd_hist', 'bb_upper', 'bb_lower', 'atr', 'sma_50')
+        for name, value, expected_value in zip(names, actual, expected):
+            with self.subTest(indicator=name):
+                if expected_value is None:
+                    self.assertTrue(math.isnan(value))
+                else:
+                    self.assertAlmostEqual(value, expected_value, delta=abs(expected_value) * 1e-9)
+
+    def test_matches_pandas_ta(self):
+        """
+        Tests that every output matches pandas-ta on a history long enough
+        for all indicators.
+        """
+        self.assert_indicators(latest_indicators(*make_prices(80)), self.EXPECTED_80)
+
+    def test_short_history_is_nan(self):
+        """
+        Tests that MACD and the 50-day SMA are NaN on a 30-day history, while
+        RSI, Bollinger Bands and ATR still match pandas-ta.
+        """
+        self.assert_indicators(latest_indicators(*make_prices(30)), self.EXPECTED_30)
@@ -3,7 +3,7 @@ from decimal import Decimal
 import pandas as pd
 from django.conf import settings
 from .kis_client import KISApiClient
-from .models import TradingAccount, Portfolio, AnalyzedStock
+from .models import TradingAccount, Portfolio, AnalyzedStock, StrategySettings
 from strategy_engine.filters import determine_market_mode
 
 logger = logging.getLogger(__name__)
@@ -45,6 +45,7 @@ class DailyTrader:
             self.max_total_risk = strategy_settings.max_total_risk
             self.dca_base_amount = strategy_settings.dca_base_amount
             self.dca_settings = strategy_settings.dca_settings_json
+            self._analyzed_stocks = None
 
             logger.info(f"DailyTrader for account {self.account.account_number} initialized.")
 
@@ -57,10 +58,11 @@ class DailyTrader:
         일일 매매 프로세스 전체를 실행합니다.
         """
         logger.info("Starting daily trading process...")
+        self._analyzed_stocks = None
 
         # 1. 시장 모드 판단
         market_mode, kospi_history = self.get_market_mode()
-        logger.info(f"Current market mode: {market_mode}")
+        logger.info("Current market mode: %s", market_mode)
 
         # 2. 보유 종목 매도 조건 확인 및 처리
         self.manage_open_positions()
@@ -87,6 +89,21 @@ class DailyTrader:
         market_mode = determine_market_mode(kospi_history)
         return market_mode, kospi_history
 
+    def load_analyzed_stocks(self):
+        """
+        Loads every AnalyzedStock row, keyed by symbol, most recently analyzed first.
+        """
+        return {stock.symbol: stock for stock in AnalyzedStock.objects.with_raw_data().order_by('-analysis_date')}
+
+    def get_analyzed_stocks(self):
+        """
+        Returns the screened universe, loaded once per trading run so that the
+        sell and buy steps share a single query instead of one per symbol.
+        """
+        if self._analyzed_stocks is None:
+            self._analyzed_stocks = self.load_analyzed_stocks()
+        return self._analyzed_stocks
+
     def manage_open_positions(self):
         """
         보유 종목을 확인하고 매도 조건을 검사하여 매도 주문을 실행합니다.
@@ -103,16 +120,19 @@ class DailyTrader:
             logger.info("No open positions found.")
             return
 
+        analyzed_stocks = self.get_analyzed_stocks()
         for stock in holdings:
             symbol = stock.get('pdno')
             try:
-                analyzed_stock = AnalyzedStock.objects.get(symbol=symbol)
+                analyzed_stock = analyzed_stocks.get(symbol)
+                if analyzed_stock is None:
+                    raise AnalyzedStock.DoesNotExist
                 if not analyzed_stock.is_investable:
                     continue
 
                 current_price_res = self.client.get_current_price(symbol)
                 if not (current_price_res and current_price_res.is_ok()):
-                    logger.warning(f"[{symbol}] Failed to get current price. Skipping sell check.")
+                    logger.warning("[%s] Failed to get current price. Skipping sell check.", symbol)
                     continue
 
                 current_price = Decimal(current_price_res.get_body().get('output', {}).get('stck_prpr', '0'))
@@ -143,7 +163,7 @@ class DailyTrader:
 
                 if should_sell:
                     quantity_to_sell = int(stock.get('hldg_qty', '0'))
-                    logger.info(f"SELL SIGNAL for {symbol}: {sell_reason}. Attempting to sell {quantity_to_sell} shares.")
+                    logger.info("SELL SIGNAL for %s: %s. Attempting to sell %s shares.", symbol, sell_reason, quantity_to_sell)
                     self.client.place_order(
                         account=self.account,
                         symbol=symbol,
@@ -154,9 +174,9 @@ class DailyTrader:
                     )
 
             except AnalyzedStock.DoesNotExist:
-                logger.warning(f"[{symbol}] No analysis data found in AnalyzedStock. Cannot manage this position.")
+                logger.warning("[%s] No analysis data found in AnalyzedStock. Cannot manage this position.", symbol)
             except Exception as e:
-                logger.error(f"Error managing position for {symbol}: {e}", exc_info=True)
+                logger.error("Error managing position for %s: %s", symbol, e, exc_info=True)
 
     def execute_short_term_buys(self):
         """
@@ -180,26 +200,27 @@ class DailyTrader:
         potential_total_risk = (num_open_positions + 1) * self.risk_per_trade
 
         if potential_total_risk > self.max_total_risk:
-            logger.warning(f"Total portfolio risk limit exceeded. "
-                           f"Current positions: {num_open_positions}, "
-                           f"Potential risk: {potential_total_risk:.2%}, "
-                           f"Limit: {self.max_total_risk:.2%}. "
-                           f"Skipping new buy orders.")
+            logger.warning("Total portfolio risk limit exceeded. "
+                           "Current positions: %s, "
+                           "Potential risk: %.2f%%, "
+                           "Limit: %.2f%%. "
+                           "Skipping new buy orders.",
+                           num_open_positions, float(potential_total_risk) * 100, float(self.max_total_risk) * 100)
             return
 
         # 3. 매수 후보 종목 선정 ('일반' 태그, 아직 보유하지 않은 종목)
-        held_symbols = [stock['pdno'] for stock in holdings]
-        buy_candidates = AnalyzedStock.objects.filter(
-            is_investable=True,
-            investment_horizon='일반'
-        ).exclude(symbol__in=held_symbols).order_by('-updated_at') # 최신 분석 순
+        held_symbols = {stock['pdno'] for stock in holdings}
+        buy_candidates = [
+            stock for stock in self.get_analyzed_stocks().values() # 최신 분석 순
+            if stock.is_investable and stock.investment_horizon == '일반' and stock.symbol not in held_symbols
+        ]
 
         if not buy_candidates:
             logger.info("No new '일반' buy candidates found.")
             return
 
         # 이 단계에서는 가장 유력한 후보 1개만 매수 시도
-        candidate = buy_candidates.first()
+        candidate = buy_candidates[0]
 
         try:
             # 4. 투자 금액 계산 (ATR 기반 리스크 균등)
@@ -207,7 +228,7 @@ class DailyTrader:
             stop_loss_multiplier = 2 # '일반' 종목의 손절 ATR 배수
 
             if atr <= 0:
-                logger.warning(f"[{candidate.symbol}] ATR is zero or invalid. Cannot calculate position size.")
+                logger.warning("[%s] ATR is zero or invalid. Cannot calculate position size.", candidate.symbol)
                 return
 
             # 리스크 금액 = 총 자산 * 개별 종목 리스크 비율
@@ -225,18 +246,18 @@ class DailyTrader:
             total_risk_per_share = loss_per_share + buy_fee + sell_fee + sell_tax
 
             if total_risk_per_share <= 0:
-                 logger.warning(f"[{candidate.symbol}] Calculated risk per share is zero or negative. Skipping.")
+                 logger.warning("[%s] Calculated risk per share is zero or negative. Skipping.", candidate.symbol)
                  return
 
             # 매수 수량 = 리스크 금액 / 1주당 총 리스크
             position_size = int(risk_amount_per_trade / total_risk_per_share)
 
             if position_size == 0:
-                logger.info(f"[{candidate.symbol}] Calculated position size is zero. Skipping buy.")
+                logger.info("[%s] Calculated position size is zero. Skipping buy.", candidate.symbol)
                 return
 
             # 5. 매수 주문 실행
-            logger.info(f"BUY SIGNAL for {candidate.symbol}. Position size: {position_size} shares based on risk management.")
+            logger.info("BUY SIGNAL for %s. Position size: %s shares based on risk management.", candidate.symbol, position_size)
             self.client.place_order(
                 account=self.account,
                 symbol=candidate.symbol,
@@ -246,7 +267,7 @@ class DailyTrader:
                 fee_rate=self.fee_rate
             )
         except Exception as e:
-            logger.error(f"Error executing buy for {candidate.symbol}: {e}", exc_info=True)
+            logger.error("Error executing buy for %s: %s", candidate.symbol, e, exc_info=True)
 
     def execute_dca_buys(self, kospi_history: list):
         """
@@ -258,7 +279,7 @@ class DailyTrader:
         # 1. 전달받은 코스피 데이터로 이평선 계산
         ma_period = self.dca_settings['KOSPI_MA_PERIOD']
         if len(kospi_history) < ma_period:
-            logger.warning(f"Not enough KOSPI data to calculate {ma_period}-day MA for DCA. Skipping buys.")
+            logger.warning("Not enough KOSPI data to calculate %s-day MA for DCA. Skipping buys.", ma_period)
             return
 
         df = pd.DataFrame(kospi_history)
@@ -278,7 +299,7 @@ class DailyTrader:
                 buy_multiplier = trigger['multiplier']
                 break
 
-        logger.info(f"KOSPI fall rate from {ma_period}MA: {fall_rate:.2%}. Buy multiplier set to {buy_multiplier}x.")
+        logger.info("KOSPI fall rate from %sMA: %.2f%%. Buy multiplier set to %sx.", ma_period, fall_rate * 100, buy_multiplier)
 
         # 3. 매수 대상 선정 (기존 보유 종목 추가 매수 또는 신규 매수)
         balance_res = self.client.get_account_balance()
@@ -291,8 +312,7 @@ class DailyTrader:
         # 보유 중인 '중/장기' 종목 찾기
         blue_chip_holdings = []
         if holdings:
-            held_symbols = [stock['pdno'] for stock in holdings]
-            analyzed_map = {s.symbol: s for s in AnalyzedStock.objects.filter(symbol__in=held_symbols)}
+            analyzed_map = self.get_analyzed_stocks()
 
             for stock in holdings:
                 analyzed = analyzed_map.get(stock['pdno'])
@@ -306,16 +326,17 @@ class DailyTrader:
             # 평가금액이 가장 작은 보유 우량주를 추가 매수 대상으로 선정
             buy_candidate_holding = min(blue_chip_holdings, key=lambda x: x['pchs_amt'])
             buy_candidate_symbol = buy_candidate_holding['pdno']
-            logger.info(f"DCA target found from existing holdings: {buy_candidate_symbol} (Purchase amount: {buy_candidate_holding['pchs_amt']})")
+            logger.info("DCA target found from existing holdings: %s (Purchase amount: %s)", buy_candidate_symbol, buy_candidate_holding['pchs_amt'])
         else:
             # 보유 중인 우량주가 없으면, 신규 후보를 찾음
-            new_candidate = AnalyzedStock.objects.filter(
-                is_investable=True,
-                investment_horizon='중/장기'
-            ).exclude(symbol__in=[s['pdno'] for s in holdings]).order_by('-updated_at').first()
+            held_symbols = {s['pdno'] for s in holdings}
+            new_candidate = next((
+                stock for stock in self.get_analyzed_stocks().values()
+                if stock.is_investable and stock.investment_horizon == '중/장기' and stock.symbol not in held_symbols
+            ), None)
             if new_candidate:
                 buy_candidate_symbol = new_candidate.symbol
-                logger.info(f"New DCA target found: {buy_candidate_symbol}")
+                logger.info("New DCA target found: %s", buy_candidate_symbol)
 
         if not buy_candidate_symbol:
             logger.info("No '중/장기' buy candidates found (neither existing nor new).")
@@ -327,23 +348,23 @@ class DailyTrader:
         # 매수 대상의 현재가 조회
         price_res = self.client.get_current_price(buy_candidate_symbol)
         if not (price_res and price_res.is_ok()):
-            logger.warning(f"[{buy_candidate_symbol}] Failed to get current price for DCA buy. Skipping.")
+            logger.warning("[%s] Failed to get current price for DCA buy. Skipping.", buy_candidate_symbol)
             return
         current_price = Decimal(price_res.get_body().get('output', {}).get('stck_prpr', '0'))
 
         if current_price <= 0:
-            logger.warning(f"[{buy_candidate_symbol}] Invalid current price ({current_price}). Skipping DCA buy.")
+            logger.warning("[%s] Invalid current price (%s). Skipping DCA buy.", buy_candidate_symbol, current_price)
             return
 
         quantity_to_buy = int(final_investment_amount // current_price)
 
         if quantity_to_buy == 0:
-            logger.info(f"[{buy_candidate_symbol}] Calculated buy quantity is zero for amount {final_investment_amount}. Skipping.")
+            logger.info("[%s] Calculated buy quantity is zero for amount %s. Skipping.", buy_candidate_symbol, final_investment_amount)
             return
 
         # 5. 매수 주문 실행
-        logger.info(f"DCA BUY SIGNAL for {buy_candidate_symbol}. "
-                    f"Amount: {final_investment_amount}, Quantity: {quantity_to_buy}")
+        logger.info("DCA BUY SIGNAL for %s. Amount: %s, Quantity: %s",
+                    buy_candidate_symbol, final_investment_amount, quantity_to_buy)
         self.client.place_order(
             account=self.account,
             symbol=buy_candidate_symbol,